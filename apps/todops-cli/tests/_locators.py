@@ -0,0 +1,29 @@
+"""Locator helpers for Selenium tests.
+
+Stick to ID and CSS selectors; XPath and class-name lookups are much slower
+in the browser and are rejected by tests/unit/test_locators.py.
+
+The driver has no implicit wait, so every lookup waits explicitly and
+returns as soon as the element is present.
+"""
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = 5
+
+
+def wait_for(driver, locator, t=DEFAULT_TIMEOUT):
+    """Wait until the element located by (By, value) is present and return it."""
+    return WebDriverWait(driver, t).until(EC.presence_of_element_located(locator))
+
+
+def by_id(driver, id_, t=DEFAULT_TIMEOUT):
+    """Find an element by its id attribute."""
+    return wait_for(driver, (By.ID, id_), t)
+
+
+def by_css(driver, selector, t=DEFAULT_TIMEOUT):
+    """Find an element by CSS selector."""
+    return wait_for(driver, (By.CSS_SELECTOR, selector), t)
@@ -1,5 +1,7 @@
 """Pytest configuration and fixtures for todops tests."""
 
+import os
+
 import pytest
 from pathlib import Path
 from dotenv import load_dotenv
@@ -35,14 +37,56 @@ def load_test_env():
 #     # Teardown: Quit the browser after the test function runs
 #     driver.quit()
 
-@pytest.fixture(scope="function")
+_gecko_driver_path = None
+
+
+def _get_gecko_driver_path():
+    """Resolve the geckodriver path once per pytest run."""
+    global _gecko_driver_path
+    if _gecko_driver_path is None:
+        _gecko_driver_path = GeckoDriverManager().install()
+    return _gecko_driver_path
+
+
+def _get_profile_dir() -> Path:
+    """Persistent Firefox profile so the login survives across runs.
+
+    Firefox locks a profile while it's open, so each xdist worker gets its own.
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    profile_dir = Path.home() / ".todops_selenium_profile" / worker_id
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    return profile_dir
+
+
+@pytest.fixture(scope="session")
 def driver():
-    # Setup: Initialize the WebDriver
-    service = Service(GeckoDriverManager().install())
-    driver = webdriver.Firefox(service=service)
-    driver.implicitly_wait(10)  # Set implicit wait
+    # Setup: Initialize the WebDriver once per session (one per xdist worker)
+    options = webdriver.FirefoxOptions()
+    if os.getenv("SEL_HEADLESS", "true").lower() == "true":
+        options.add_argument("--headless")
+    options.add_argument("-profile")
+    options.add_argument(str(_get_profile_dir()))
+
+    service = Service(_get_gecko_driver_path())
+    # No implicit wait: lookups use explicit waits from tests/_locators.py
+    driver = webdriver.Firefox(service=service, options=options)
 
     yield driver
 
-    # Teardown: Quit the browser after the test function runs
+    # Teardown: Quit the browser after the test session finishes
     driver.quit()
+
+
+@pytest.fixture(autouse=True)
+def reset_driver_state(request):
+    """Reset browser state between tests that share the session driver.
+
+    Cookies are kept on purpose: the authenticated session lives in the profile.
+    """
+    yield
+
+    if "driver" in request.fixturenames:
+        driver = request.getfixturevalue("driver")
+        driver.switch_to.default_content()
+        driver.get("about:blank")
@@ -1,4 +1,9 @@
-from todops.loki.client import LokiClient
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from todops.loki.client import LokiClient, _build_ignore_filters
 from datetime import datetime, timedelta
 
 def test_parse_time_expression():
@@ -27,3 +32,126 @@ def test_format_timestamp():
     client = LokiClient(base_url="http://localhost:3100")
     now = datetime.now()
     one_hour_ago = client._format_timestamp(now)
+
+
+def test_parse_time_expression_short_form():
+    client = LokiClient(base_url="http://localhost:3100")
+    now = datetime.now()
+
+    one_hour_ago = client._parse_time_expression("1h")
+    assert 3600 - 5 <= (now - one_hour_ago).total_seconds() <= 3600 + 5
+
+    thirty_minutes_ago = client._parse_time_expression("30m ago")
+    assert 1800 - 5 <= (now - thirty_minutes_ago).total_seconds() <= 1800 + 5
+
+    # Mixed expressions fall back to the regex parser
+    mixed = client._parse_time_expression("1d 2h ago")
+    assert 7200 - 5 <= (now - mixed).total_seconds() <= 7200 + 5
+
+
+def test_parse_time_expression_rejects_non_ascii_digits():
+    client = LokiClient(base_url="http://localhost:3100")
+
+    # "²" passes str.isdigit() but not int(); it must not reach the fast path
+    with pytest.raises(ValueError, match="Invalid timestamp format"):
+        client._parse_time_expression("\u00b2h")
+
+
+def test_build_ignore_filters_merges_signatures():
+    filters = _build_ignore_filters([
+        {'log_signature': 'Connection timeout'},
+        {'log_signature': 'Retrying .* operation'},
+    ])
+
+    assert filters == ['(?:Connection timeout)|(?:Retrying .* operation)']
+
+
+def test_build_ignore_filters_chunks_long_lists():
+    ignore_list = [{'log_signature': 'x' * 1000} for _ in range(10)]
+
+    filters = _build_ignore_filters(ignore_list)
+
+    assert len(filters) > 1
+    assert all(len(f) <= 4096 for f in filters)
+    assert sum(f.count('(?:') for f in filters) == 10
+
+
+def _loki_result(timestamps):
+    return {
+        'status': 'success',
+        'data': {
+            'result': [{
+                'stream': {'namespace': 'tools', 'instance': 'todo-bot-1'},
+                'values': [[str(ts), f"line {ts}"] for ts in timestamps],
+            }]
+        }
+    }
+
+
+def test_search_logs_top_n_returns_most_recent_entries():
+    client = LokiClient(base_url="http://localhost:3100")
+    client.query_range = lambda *args, **kwargs: _loki_result([5, 1, 9, 3, 7])
+
+    entries = client.search_logs("line", top_n=2)
+
+    assert [e.timestamp_ns for e in entries] == [9, 7]
+    assert client.last_match_count == 5
+
+
+def _captured_query(**kwargs):
+    client = LokiClient(base_url="http://localhost:3100")
+    captured = {}
+
+    def fake_query_range(query, *args, **kw):
+        captured['query'] = query
+        return {'status': 'success', 'data': {'result': []}}
+
+    client.query_range = fake_query_range
+    client.search_logs(**kwargs)
+    return captured['query']
+
+
+def test_search_logs_query_filters():
+    assert _captured_query(search_term="Error").endswith(' |~ "(?i)Error"')
+    assert _captured_query(search_term="a b").endswith(' |~ "(?i)a\\\\ b"')
+    assert _captured_query(search_term="Error", case_sensitive=True).endswith(' |= "Error"')
+    assert _captured_query(search_term="500").endswith(' |= "500"')
+    assert _captured_query(search_term='say "hi"', case_sensitive=True).endswith(' |= "say \\"hi\\""')
+
+
+def test_search_logs_ignore_filters_split_literal_and_regex():
+    query = _captured_query(search_term="error", ignore_list=[
+        {'log_signature': 'Connection timeout'},
+        {'log_signature': 'Retrying .* operation'},
+        {'log_signature': 'health check'},
+    ])
+
+    assert query.endswith(
+        ' != "Connection timeout" != "health check" !~ "(?:Retrying .* operation)"'
+    )
+
+
+def test_search_logs_multiple_namespaces_use_one_selector():
+    query = _captured_query(search_term=".", namespace="tools, todo")
+
+    assert query == '{job=~".+", namespace=~"tools|todo"}'
+
+
+def test_search_logs_ignore_filters_skip_duplicate_signatures():
+    query = _captured_query(search_term=".", ignore_list=[
+        {'log_signature': 'Connection timeout'},
+        {'log_signature': 'Connection timeout'},
+    ])
+
+    assert query.count('Connection timeout') == 1
+
+
+def test_query_range_defaults_end_to_now():
+    client = LokiClient(base_url="http://localhost:3100")
+    response = MagicMock(content=b'{"status": "success", "data": {"result": []}}')
+    client.session.get = MagicMock(return_value=response)
+
+    client.query_range('{job=~".+"}', datetime.now() - timedelta(hours=1))
+
+    end_ns = int(client.session.get.call_args.kwargs['params']['end'])
+    assert abs(end_ns / 1e9 - time.time()) < 5
@@ -0,0 +1,48 @@
+import json
+
+from todops.loki.client import LogEntry
+from todops.loki.helpers import highlight_search_term, output_json, output_raw
+
+
+def test_highlight_search_term_is_case_insensitive():
+    message = "Error: connection error, retrying after ERROR"
+
+    assert (
+        highlight_search_term(message, "error")
+        == "[ERROR]: connection [ERROR], retrying after [ERROR]"
+    )
+
+
+def test_highlight_search_term_without_match():
+    assert highlight_search_term("all good", "error") == "all good"
+
+
+def test_highlight_search_term_escapes_regex_characters():
+    assert highlight_search_term("value a.b and axb", "a.b") == "value [A.B] and axb"
+
+
+def _entry(message, namespace="default", app="api"):
+    return LogEntry(
+        1_700_000_000_000_000_000,
+        {"app": app},
+        message,
+        namespace,
+        "pod-1",
+        "main",
+        app,
+        "info",
+    )
+
+
+def test_output_raw_prefixes_namespace_and_app(capsys):
+    output_raw([_entry("first"), _entry("second", namespace="prod", app="web")])
+
+    assert capsys.readouterr().out == "[default/api] first\n[prod/web] second\n"
+
+
+def test_output_json_round_trips(capsys):
+    output_json([_entry("héllo")])
+
+    entries = json.loads(capsys.readouterr().out)
+    assert entries[0]["message"] == "héllo"
+    assert entries[0]["namespace"] == "default"
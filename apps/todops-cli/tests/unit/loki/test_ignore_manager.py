@@ -0,0 +1,224 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from minio.error import S3Error, ServerError
+
+from todops.loki.ignore_manager import LokiIgnoreManager
+
+
+def _make_manager():
+    with patch('todops.loki.ignore_manager.Minio'):
+        manager = LokiIgnoreManager("http://localhost:9000", "key", "secret")
+    return manager, manager.client
+
+
+def _object_response(entries, etag):
+    response = MagicMock()
+    response.read.return_value = json.dumps(entries).encode('utf-8')
+    response.headers = {'ETag': f'"{etag}"'}
+    return response
+
+
+def _not_modified():
+    return ServerError("server failed with HTTP status code 304", 304)
+
+
+def test_load_ignore_list_reuses_cache_when_not_modified():
+    manager, client = _make_manager()
+    entries = [{'id': '1', 'log_signature': 'timeout', 'status': 'active'}]
+    client.get_object.return_value = _object_response(entries, 'abc')
+
+    assert manager._load_ignore_list() == entries
+    client.get_object.side_effect = _not_modified()
+    assert manager._load_ignore_list() == entries
+
+    assert client.get_object.call_args.kwargs['request_headers'] == {'If-None-Match': '"abc"'}
+
+
+def test_load_ignore_list_refetches_when_etag_changes():
+    manager, client = _make_manager()
+    client.get_object.return_value = _object_response([], 'abc')
+    manager._load_ignore_list()
+
+    updated = [{'id': '2', 'log_signature': 'retrying', 'status': 'active'}]
+    client.get_object.return_value = _object_response(updated, 'def')
+
+    assert manager._load_ignore_list() == updated
+    assert client.get_object.call_count == 2
+
+
+def _s3_error(code):
+    return S3Error(code, code, None, None, None, None)
+
+
+def test_init_does_not_check_bucket():
+    _, client = _make_manager()
+
+    client.bucket_exists.assert_not_called()
+
+
+def test_save_creates_missing_bucket():
+    manager, client = _make_manager()
+    client.put_object.side_effect = [_s3_error('NoSuchBucket'), MagicMock(etag='abc')]
+    client.bucket_exists.return_value = False
+
+    manager._save_ignore_list([])
+
+    client.make_bucket.assert_called_once_with(LokiIgnoreManager.BUCKET_NAME)
+    assert client.put_object.call_count == 2
+
+
+def test_load_returns_empty_list_when_bucket_missing():
+    manager, client = _make_manager()
+    client.get_object.side_effect = _s3_error('NoSuchBucket')
+
+    assert manager._load_ignore_list() == []
+
+
+def test_list_entries_marks_all_past_expiry_entries_expired():
+    manager, client = _make_manager()
+    entries = [
+        {'id': '1', 'log_signature': 'old', 'status': 'active', 'expire_date': '2000-01-01T00:00:00+00:00'},
+        {'id': '2', 'log_signature': 'new', 'status': 'active', 'expire_date': '2999-01-01T00:00:00+00:00'},
+        {'id': '3', 'log_signature': 'naive', 'status': 'inactive', 'expire_date': '2000-01-01T00:00:00'},
+    ]
+    client.get_object.return_value = _object_response(entries, 'abc')
+    client.put_object.return_value = MagicMock(etag='def')
+
+    listed = manager.list_entries()
+
+    assert [e['status'] for e in listed] == ['expired', 'active', 'expired']
+    saved = json.loads(client.put_object.call_args[0][2].getvalue())
+    assert [e['status'] for e in saved] == ['expired', 'active', 'expired']
+    assert [e['id'] for e in manager.list_entries(active_only=True)] == ['2']
+
+
+def test_list_entries_does_not_resave_already_expired_entries():
+    manager, client = _make_manager()
+    entries = [{'id': '1', 'log_signature': 'old', 'status': 'expired', 'expire_date': '2000-01-01T00:00:00'}]
+    client.get_object.return_value = _object_response(entries, 'abc')
+
+    manager.list_entries()
+
+    client.put_object.assert_not_called()
+
+
+def test_batch_writes_once_for_several_changes():
+    manager, client = _make_manager()
+    entries = [
+        {'id': '1', 'log_signature': 'timeout', 'status': 'active'},
+        {'id': '2', 'log_signature': 'retrying', 'status': 'active'},
+    ]
+    client.get_object.return_value = _object_response(entries, 'abc')
+    client.put_object.return_value = MagicMock(etag='def')
+
+    with manager.batch():
+        assert manager.update_status('1', 'inactive')
+        assert manager.delete_entry('2')
+        manager.add_ignore_entry('refused', '1 day')
+
+    assert client.get_object.call_count == 1
+    assert client.put_object.call_count == 1
+    saved = json.loads(client.put_object.call_args[0][2].getvalue())
+    assert [(e['log_signature'], e['status']) for e in saved] == [
+        ('timeout', 'inactive'), ('refused', 'active'),
+    ]
+
+
+def test_batch_skips_write_when_block_raises():
+    manager, client = _make_manager()
+    client.get_object.return_value = _object_response([{'id': '1', 'status': 'active'}], 'abc')
+
+    try:
+        with manager.batch():
+            manager.update_status('1', 'inactive')
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    client.put_object.assert_not_called()
+
+
+def test_cache_file_avoids_download_in_new_manager(tmp_path):
+    cache_file = tmp_path / 'ignore_list.json'
+    entries = [{'id': '1', 'log_signature': 'timeout', 'status': 'active'}]
+
+    first, first_client = _make_manager()
+    first.cache_file = cache_file
+    first_client.get_object.return_value = _object_response(entries, 'abc')
+    first._load_ignore_list()
+
+    second, second_client = _make_manager()
+    second.cache_file = cache_file
+    second_client.get_object.side_effect = _not_modified()
+
+    assert second._load_ignore_list() == entries
+    assert second_client.get_object.call_args.kwargs['request_headers'] == {'If-None-Match': '"abc"'}
+
+
+def test_cache_file_ignored_for_other_endpoint(tmp_path):
+    cache_file = tmp_path / 'ignore_list.json'
+    cache_file.write_text(json.dumps({'endpoint': 'elsewhere:9000', 'etag': 'abc', 'ignore_list': []}))
+    manager, client = _make_manager()
+    manager.cache_file = cache_file
+    client.get_object.return_value = _object_response([], 'abc')
+
+    manager._load_ignore_list()
+
+    assert client.get_object.call_args.kwargs['request_headers'] is None
+
+
+def test_parse_duration_units():
+    manager, _ = _make_manager()
+    cases = {
+        '30 minutes': timedelta(minutes=30),
+        '3h': timedelta(hours=3),
+        '7 days': timedelta(days=7),
+        '2 weeks': timedelta(weeks=2),
+        '1 month': timedelta(days=30),
+        '2mo': timedelta(days=60),
+    }
+
+    for duration, expected in cases.items():
+        before = datetime.now(timezone.utc)
+        delta = manager._parse_duration(duration) - before
+        assert abs(delta - expected) < timedelta(seconds=5), duration
+
+
+def test_parse_duration_rejects_unknown_units():
+    manager, _ = _make_manager()
+
+    with pytest.raises(ValueError):
+        manager._parse_duration('5 fortnights')
+
+
+def test_list_entries_ignores_stale_expire_ts():
+    manager, client = _make_manager()
+    # expire_ts from an earlier version; an older CLI then moved expire_date
+    entries = [{'id': '1', 'log_signature': 'timeout', 'status': 'active',
+                'expire_date': '2999-01-01T00:00:00+00:00', 'expire_ts': 946684800}]
+    client.get_object.return_value = _object_response(entries, 'abc')
+
+    assert [e['status'] for e in manager.list_entries()] == ['active']
+    client.put_object.assert_not_called()
+
+
+def test_add_ignore_entry_refreshes_expiry_across_second_boundary():
+    manager, client = _make_manager()
+    client.get_object.return_value = _object_response([], 'abc')
+    client.put_object.return_value = MagicMock(etag='def')
+    first_expiry = datetime(2030, 1, 1, 11, 59, 59, 999999, tzinfo=timezone.utc)
+    second_expiry = first_expiry + timedelta(microseconds=2)
+
+    with patch.object(manager, '_parse_duration', side_effect=[first_expiry, second_expiry]):
+        first_id, _ = manager.add_ignore_entry('timeout', '7 days')
+        client.get_object.side_effect = _not_modified()
+        assert manager.add_ignore_entry('timeout', '7 days') == (first_id, second_expiry)
+
+    assert client.put_object.call_count == 2
+    saved = json.loads(client.put_object.call_args[0][2].getvalue())
+    assert len(saved) == 1
+    assert saved[0]['expire_date'] == second_expiry.isoformat()
+    assert 'expire_ts' not in saved[0]
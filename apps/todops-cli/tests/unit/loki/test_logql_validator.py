@@ -0,0 +1,27 @@
+import pytest
+
+from todops.loki._logql_validator import LogQLValidationError, validate
+
+
+def test_validate_accepts_generated_queries():
+    validate('{job=~".+", namespace="tools"}')
+    validate(
+        '{job=~".+"} |~ "(?i)connection\\\\ refused" != "health" !~ "(?:Retry.*)|(?:x)"'
+    )
+    validate('{job=~".+"} |= "say \\"hi\\"" | json')
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        'job=~".+"',  # missing selector braces
+        '{job=~".+"',  # unclosed selector
+        '{job=~".+"} |= "unterminated',  # unterminated string
+        '{job=~".+"} |~ "a\\.b"',  # invalid Go string escape
+        '{job=~".+"} !~ "(unbalanced"',  # broken regex
+        '{job=~".+"} error',  # not a filter
+    ],
+)
+def test_validate_rejects_malformed_queries(query):
+    with pytest.raises(LogQLValidationError):
+        validate(query)
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from todops.loki._result_cache import ResultCache
+from todops.loki.client import LokiClient
+
+
+def test_result_cache_roundtrip(tmp_path):
+    cache = ResultCache(tmp_path, ttl=60)
+    key = cache.make_key("q", 1, 2)
+
+    assert cache.get(key) is None
+    cache.set(key, {"status": "success"})
+    assert cache.get(key) == {"status": "success"}
+
+
+def test_result_cache_expires(tmp_path):
+    cache = ResultCache(tmp_path, ttl=-1)
+    key = cache.make_key("q")
+    cache.set(key, [1, 2])
+
+    assert cache.get(key) is None
+
+
+def test_query_range_serves_repeated_queries_from_cache(tmp_path):
+    client = LokiClient(base_url="http://localhost:3100")
+    client.result_cache = ResultCache(tmp_path, ttl=60)
+    response = MagicMock(content=b'{"status": "success", "data": {"result": []}}')
+    client.session.get = MagicMock(return_value=response)
+
+    start = datetime.now() - timedelta(hours=1)
+    end = datetime.now()
+    first = client.query_range('{job=~".+"}', start, end)
+    second = client.query_range('{job=~".+"}', start, end)
+
+    assert first == second == {"status": "success", "data": {"result": []}}
+    assert client.session.get.call_count == 1
@@ -0,0 +1,50 @@
+from todops.slack.client import SlackClient
+
+
+def _client():
+    return SlackClient(token="xoxb-test")
+
+
+def test_create_message_blocks_groups_sections():
+    message = "\n".join(
+        [
+            "*✅ Deploy finished*",
+            "",
+            "service: api",
+            "📈 *Metrics*",
+            "  p99: 120ms",
+            "errors: 0",
+            "🔍 *Details*",
+            "see dashboard",
+        ]
+    )
+
+    blocks = _client()._create_message_blocks(message)
+
+    assert blocks[0] == {
+        "type": "header",
+        "text": {"type": "plain_text", "text": "✅ Deploy finished"},
+    }
+    assert blocks[1] == {"type": "divider"}
+    assert blocks[2]["elements"][0]["text"] == (
+        "service: api\n\n📈 *Metrics*\n\np99: 120ms\nerrors: 0\n\n🔍 *Details*\n\nsee dashboard"
+    )
+
+
+def test_create_message_blocks_emoji_without_bold_is_content():
+    blocks = _client()._create_message_blocks("Header\n📊 plain line\nmore")
+
+    assert blocks[2]["elements"][0]["text"] == "📊 plain line\nmore"
+
+
+def test_create_message_blocks_empty_message():
+    assert _client()._create_message_blocks("\n  \n") == []
+
+
+def test_resolve_channel():
+    client = _client()
+
+    assert client.resolve_channel("#ops") == "#ops"
+    assert client.resolve_channel("C0123") == "C0123"
+    assert client.resolve_channel("alerts") == "#alerts"
+    assert client.resolve_channel("random") == "#random"
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+FORBIDDEN_LOCATORS = [
+    "By.XPATH",
+    "By.CLASS_NAME",
+    "find_element_by_xpath",
+    '"xpath"',
+    '"class name"',
+]
+
+
+def test_integration_tests_avoid_slow_locators():
+    integration_dir = Path(__file__).parent.parent / "integration"
+
+    for path in integration_dir.rglob("*.py"):
+        source = path.read_text()
+        for locator in FORBIDDEN_LOCATORS:
+            assert (
+                locator not in source
+            ), f"{path.name} uses {locator}; use by_id/by_css from _locators"
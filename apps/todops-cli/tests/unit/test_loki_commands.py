@@ -0,0 +1,24 @@
+import pytest
+
+from todops.loki_commands import get_loki_url
+
+
+@pytest.fixture(autouse=True)
+def clear_loki_url_cache():
+    get_loki_url.cache_clear()
+    yield
+    get_loki_url.cache_clear()
+
+
+def test_get_loki_url_prefers_env(monkeypatch):
+    monkeypatch.setenv("LOKI_URL", "http://loki.example:3100")
+
+    assert get_loki_url() == "http://loki.example:3100"
+
+
+def test_get_loki_url_is_cached(monkeypatch):
+    monkeypatch.setenv("LOKI_URL", "http://first:3100")
+    get_loki_url()
+    monkeypatch.setenv("LOKI_URL", "http://second:3100")
+
+    assert get_loki_url() == "http://first:3100"
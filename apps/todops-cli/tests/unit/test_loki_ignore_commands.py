@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+
+from todops.loki_ignore_commands import ignore
+
+
+def test_apply_runs_every_operation_with_one_manager(monkeypatch):
+    monkeypatch.setenv("MINIO_ACCESS_KEY", "key")
+    monkeypatch.setenv("MINIO_SECRET_KEY", "secret")
+    manager = MagicMock()
+    manager.add_ignore_entry.return_value = ("new-id", None)
+    manager.delete_entry.return_value = True
+    manager.update_status.return_value = False
+    lines = "\n".join(
+        [
+            '{"op": "set", "log_signature": "timeout", "duration": "2 days"}',
+            '{"op": "delete", "id": "a"}',
+            '{"op": "deactivate", "id": "b"}',
+        ]
+    )
+
+    with patch(
+        "todops.loki.ignore_manager.LokiIgnoreManager", return_value=manager
+    ) as factory:
+        result = CliRunner().invoke(ignore, ["apply"], input=lines)
+
+    assert result.exit_code == 0, result.output
+    factory.assert_called_once()
+    manager.add_ignore_entry.assert_called_once_with("timeout", "2 days")
+    manager.delete_entry.assert_called_once_with("a")
+    manager.update_status.assert_called_once_with("b", "inactive")
+    assert "3: not found b" in result.output
+
+
+def test_apply_reports_bad_lines(monkeypatch):
+    monkeypatch.setenv("MINIO_ACCESS_KEY", "key")
+    monkeypatch.setenv("MINIO_SECRET_KEY", "secret")
+
+    with patch("todops.loki.ignore_manager.LokiIgnoreManager"):
+        result = CliRunner().invoke(
+            ignore, ["apply"], input='{"op": "rename"}\nnot json\n'
+        )
+
+    assert result.exit_code == 1
+    assert "2 operation(s) failed" in result.output
+
+
+def test_apply_file_saves_with_one_put_object(monkeypatch, tmp_path):
+    monkeypatch.setenv("MINIO_ACCESS_KEY", "key")
+    monkeypatch.setenv("MINIO_SECRET_KEY", "secret")
+    monkeypatch.setattr(
+        "todops.loki.ignore_manager.DEFAULT_CACHE_FILE", tmp_path / "ignore_list.json"
+    )
+    changes = tmp_path / "changes.jsonl"
+    changes.write_text(
+        "\n".join(
+            [
+                '{"op": "set", "log_signature": "timeout"}',
+                '{"op": "set", "log_signature": "retrying", "duration": "2 days"}',
+                '{"op": "deactivate", "id": "a"}',
+            ]
+        )
+    )
+
+    with patch("todops.loki.ignore_manager.Minio") as minio:
+        client = minio.return_value
+        response = client.get_object.return_value
+        response.read.return_value = (
+            b'[{"id": "a", "log_signature": "old", "status": "active"}]'
+        )
+        response.headers = {"ETag": '"abc"'}
+        client.put_object.return_value = MagicMock(etag="def")
+        result = CliRunner().invoke(ignore, ["apply", "-f", str(changes)])
+
+    assert result.exit_code == 0, result.output
+    client.put_object.assert_called_once()
+    saved = json.loads(client.put_object.call_args[0][2].getvalue())
+    assert [(e["log_signature"], e["status"]) for e in saved] == [
+        ("old", "inactive"),
+        ("timeout", "active"),
+        ("retrying", "active"),
+    ]
+
+
+def test_apply_is_listed_in_help():
+    result = CliRunner().invoke(ignore, ["--help"])
+
+    assert "apply" in result.output
+
+
+def test_list_renders_table(monkeypatch):
+    monkeypatch.setenv("MINIO_ACCESS_KEY", "key")
+    monkeypatch.setenv("MINIO_SECRET_KEY", "secret")
+    manager = MagicMock()
+    manager.list_entries.return_value = [
+        {
+            "id": "abc",
+            "log_signature": "x" * 50,
+            "status": "active",
+            "expire_date": "2030-01-02T03:04:05+00:00",
+        }
+    ]
+
+    with patch("todops.loki.ignore_manager.LokiIgnoreManager", return_value=manager):
+        result = CliRunner().invoke(ignore, ["list"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == "Loki Ignore List:"
+    assert (
+        lines[4]
+        == f"{'abc':<40} {'x' * 34 + '...':<40} {'active':<10} {'2030-01-02 03:04':<20}"
+    )
+    assert lines[-1] == "Total entries: 1"
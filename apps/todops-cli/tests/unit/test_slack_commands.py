@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from todops.slack_commands import slack
+
+
+def test_post_messages_uses_one_client():
+    lines = "\n".join(
+        [
+            '{"channel": "alerts", "text": "first"}',
+            "",
+            '{"channel": "#dev", "text": "second"}',
+            '{"text": "no channel"}',
+        ]
+    )
+
+    with patch("todops.slack.client.SlackClient") as factory:
+        factory.return_value.post_message.return_value = True
+        result = CliRunner().invoke(slack, ["post-messages"], input=lines)
+
+    factory.assert_called_once()
+    posted = [
+        call.args[:2] for call in factory.return_value.post_message.call_args_list
+    ]
+    assert posted == [("alerts", "first"), ("#dev", "second")]
+    assert result.exit_code == 1
+    assert "Line 4: invalid message" in result.output
+
+
+def test_post_message_rejects_non_utf8_stdin():
+    with patch("todops.slack.client.SlackClient") as factory:
+        result = CliRunner().invoke(slack, ["post-message", "dev"], input=b"caf\xe9\n")
+
+    assert result.exit_code == 1
+    assert "must be UTF-8" in result.output
+    factory.return_value.post_message.assert_not_called()
+
+
+def test_post_message_strips_stdin():
+    with patch("todops.slack.client.SlackClient") as factory:
+        factory.return_value.post_message.return_value = True
+        result = CliRunner().invoke(
+            slack, ["post-message", "dev"], input="  hello \u2705\n"
+        )
+
+    assert result.exit_code == 0, result.output
+    factory.return_value.post_message.assert_called_once_with(
+        "dev", "hello \u2705", use_blocks=False
+    )
+
+
+def test_post_message_code_from_stdin_keeps_indentation():
+    with patch("todops.slack.client.SlackClient") as factory:
+        factory.return_value.post_message.return_value = True
+        result = CliRunner().invoke(
+            slack, ["post-message", "dev", "--code"], input="    indented()\nnext\n"
+        )
+
+    assert result.exit_code == 0, result.output
+    factory.return_value.post_message.assert_called_once_with(
+        "dev", "```\n    indented()\nnext\n```", use_blocks=False
+    )
@@ -0,0 +1,6 @@
+"""Entry point for `python -m todops`."""
+
+from todops.cli import main
+
+if __name__ == "__main__":
+    main(prog_name="todops")
@@ -0,0 +1,19 @@
+"""Load .env once per CLI process."""
+
+import functools
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_env() -> bool:
+    """Load ./.env once per process; called by command groups that read env vars.
+
+    Existing environment variables are not overridden. Returns False if the
+    file doesn't exist.
+    """
+    env_path = Path(".env")
+    if not env_path.is_file():
+        return False
+    return load_dotenv(dotenv_path=env_path)
@@ -1,23 +1,18 @@
 """Main CLI module for todops."""
 
-import os
-from pathlib import Path
 import click
-from dotenv import load_dotenv
 from todops import __version__
+from todops.context import cli_state
 from todops.loki_commands import loki
 from todops.loki_ignore_commands import ignore
 from todops.slack_commands import slack
 
-# Load .env file if it exists
-env_path = Path('.') / '.env'
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-
 @click.group()
-def main():
+@click.pass_context
+def main(ctx: click.Context):
     """todops - A minimal CLI for todo platform operations."""
-    pass
+    # Clients and managers are cached here and shared by subcommands
+    cli_state(ctx)
 
 
 main.add_command(loki)
@@ -0,0 +1,50 @@
+"""Per-process state shared by todops CLI commands."""
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict
+
+import click
+
+# The clients pull in requests and the MinIO SDK; import them on first use
+# so `todops --help` and unrelated commands start quickly.
+if TYPE_CHECKING:
+    from todops.loki.client import LokiClient
+    from todops.loki.ignore_manager import LokiIgnoreManager
+
+
+def cli_state(ctx: click.Context) -> SimpleNamespace:
+    """Return the shared state stored on the root click context, creating it on first use."""
+    root = ctx.find_root()
+    if root.obj is None:
+        root.obj = SimpleNamespace(loki_clients={}, ignore_managers={})
+    return root.obj
+
+
+def get_loki_client(ctx: click.Context, url: str) -> "LokiClient":
+    """Return a LokiClient for url, reusing one created earlier in this process."""
+    clients = cli_state(ctx).loki_clients
+    client = clients.get(url)
+    if client is None:
+        from todops.loki.client import LokiClient
+
+        client = clients[url] = LokiClient(url)
+    return client
+
+
+def get_ignore_manager(
+    ctx: click.Context, config: Dict[str, str]
+) -> "LokiIgnoreManager":
+    """Return a LokiIgnoreManager for the MinIO config, reusing one created earlier."""
+    managers = cli_state(ctx).ignore_managers
+    key = (config["url"], config["access_key"], config["secret_key"])
+    manager = managers.get(key)
+    if manager is None:
+        from todops.loki.ignore_manager import DEFAULT_CACHE_FILE, LokiIgnoreManager
+
+        manager = managers[key] = LokiIgnoreManager(
+            config["url"],
+            config["access_key"],
+            config["secret_key"],
+            cache_file=DEFAULT_CACHE_FILE,
+        )
+    return manager
@@ -0,0 +1,182 @@
+"""Local syntax check for the LogQL queries built by LokiClient.
+
+Covers the subset the CLI generates: a stream selector followed by line
+filters. Anything after the first other pipeline stage (e.g. `| json`) is
+accepted as-is and left for Loki to check.
+"""
+
+import re
+from functools import lru_cache
+
+_LABEL = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+_MATCHER_OPS = ("=~", "!~", "!=", "=")
+_LINE_FILTER_OPS = ("|=", "!=", "|~", "!~")
+_REGEX_OPS = ("=~", "!~", "|~")
+
+_SIMPLE_ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "\\": "\\",
+    '"': '"',
+}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# re errors that are also invalid in Loki's RE2 syntax
+_REGEX_ERRORS = (
+    "missing )",
+    "unbalanced parenthesis",
+    "unterminated character set",
+    "nothing to repeat",
+    "multiple repeat",
+)
+
+
+class LogQLValidationError(ValueError):
+    """Raised when a LogQL query is malformed."""
+
+    def __init__(self, message: str, query: str, column: int):
+        super().__init__(f"Invalid LogQL at column {column + 1}: {message}\n  {query}")
+        self.column = column
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.query = query
+        self.pos = 0
+
+    def error(self, message: str, column: int = None):
+        raise LogQLValidationError(
+            message, self.query, self.pos if column is None else column
+        )
+
+    def skip_spaces(self):
+        while self.pos < len(self.query) and self.query[self.pos].isspace():
+            self.pos += 1
+
+    def at_end(self) -> bool:
+        self.skip_spaces()
+        return self.pos >= len(self.query)
+
+    def expect(self, token: str):
+        self.skip_spaces()
+        if not self.query.startswith(token, self.pos):
+            self.error(f"expected '{token}'")
+        self.pos += len(token)
+
+    def operator(self, operators) -> str:
+        self.skip_spaces()
+        for op in operators:
+            if self.query.startswith(op, self.pos):
+                self.pos += len(op)
+                return op
+        self.error(f"expected one of {', '.join(operators)}")
+
+    def string(self) -> str:
+        """Parse a double-quoted (Go escape rules) or backtick string and return its value."""
+        self.skip_spaces()
+        start = self.pos
+        query = self.query
+
+        if query.startswith("`", start):
+            end = query.find("`", start + 1)
+            if end == -1:
+                self.error("unterminated string", start)
+            self.pos = end + 1
+            return query[start + 1 : end]
+
+        if not query.startswith('"', start):
+            self.error("expected a quoted string")
+
+        chars = []
+        i = start + 1
+        while i < len(query):
+            c = query[i]
+            if c == '"':
+                self.pos = i + 1
+                return "".join(chars)
+            if c != "\\":
+                chars.append(c)
+                i += 1
+                continue
+
+            esc = query[i + 1 : i + 2]
+            if esc in _SIMPLE_ESCAPES:
+                chars.append(_SIMPLE_ESCAPES[esc])
+                i += 2
+            elif esc in _HEX_ESCAPES:
+                digits = query[i + 2 : i + 2 + _HEX_ESCAPES[esc]]
+                if len(digits) != _HEX_ESCAPES[esc] or not set(digits) <= _HEX_DIGITS:
+                    self.error(f"invalid \\{esc} escape in string", i)
+                chars.append(chr(int(digits, 16)))
+                i += 2 + len(digits)
+            elif esc and esc in "01234567":
+                digits = query[i + 1 : i + 4]
+                if len(digits) != 3 or not set(digits) <= set("01234567"):
+                    self.error("invalid octal escape in string", i)
+                chars.append(chr(int(digits, 8)))
+                i += 4
+            else:
+                self.error(f"invalid escape '\\{esc}' in string", i)
+
+        self.error("unterminated string", start)
+
+    def regex(self):
+        """Parse a string and check it is a usable regular expression."""
+        self.skip_spaces()
+        start = self.pos
+        value = self.string()
+        try:
+            re.compile(value)
+        except re.error as e:
+            if any(message in str(e) for message in _REGEX_ERRORS):
+                self.error(f"invalid regex: {e}", start)
+
+    def selector(self):
+        self.expect("{")
+        while True:
+            self.skip_spaces()
+            match = _LABEL.match(self.query, self.pos)
+            if not match:
+                self.error("expected a label name")
+            self.pos = match.end()
+
+            op = self.operator(_MATCHER_OPS)
+            if op in _REGEX_OPS:
+                self.regex()
+            else:
+                self.string()
+
+            self.skip_spaces()
+            if self.query.startswith(",", self.pos):
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def pipeline(self):
+        while not self.at_end():
+            if not self.query.startswith(_LINE_FILTER_OPS, self.pos):
+                if self.query.startswith("|", self.pos):
+                    # Parser/formatter stages are beyond what the CLI builds
+                    return
+                self.error("expected a line filter")
+
+            op = self.operator(_LINE_FILTER_OPS)
+            if op in _REGEX_OPS:
+                self.regex()
+            else:
+                self.string()
+
+
+@lru_cache(maxsize=128)
+def validate(query: str) -> None:
+    """Raise LogQLValidationError if the query is malformed; results are cached per query."""
+    parser = _Parser(query)
+    parser.selector()
+    parser.pipeline()
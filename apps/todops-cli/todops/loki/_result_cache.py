@@ -0,0 +1,54 @@
+"""On-disk cache of Loki query results for repeated searches."""
+
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "todops" / "loki"
+DEFAULT_TTL = 300
+
+
+class ResultCache:
+    """JSON files keyed by a hash of the query; entries expire after ttl seconds."""
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, ttl: int = DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash the parts that identify a query into a cache key."""
+        return hashlib.sha1(
+            "\x1f".join(str(p) for p in parts).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a value; failures are logged and ignored since the cache is optional."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(value))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write result cache {path}: {e}")
@@ -1,15 +1,167 @@
-import json
+import heapq
 import logging
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import click
+import orjson
 import requests
 from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from todops.loki._logql_validator import validate as validate_logql
 
 logger = logging.getLogger(__name__)
 
+# Relative time patterns used by LokiClient._parse_time_expression
+_TIME_PATTERNS = tuple(
+    (re.compile(pattern), unit)
+    for pattern, unit in [
+        (r'(\d+)\s*h(?:our)?s?', 'hours'),
+        (r'(\d+)\s*m(?:in(?:ute)?)?s?', 'minutes'),
+        (r'(\d+)\s*s(?:ec(?:ond)?)?s?', 'seconds'),
+        (r'(\d+)\s*d(?:ay)?s?', 'days'),
+        (r'(\d+)\s*w(?:eek)?s?', 'weeks'),
+    ]
+)
+
+# Unit suffixes accepted by the fast path, e.g. "1h", "30 minutes"
+_TIME_UNITS = {
+    'h': 'hours', 'hr': 'hours', 'hrs': 'hours', 'hour': 'hours', 'hours': 'hours',
+    'm': 'minutes', 'min': 'minutes', 'mins': 'minutes', 'minute': 'minutes', 'minutes': 'minutes',
+    's': 'seconds', 'sec': 'seconds', 'secs': 'seconds', 'second': 'seconds', 'seconds': 'seconds',
+    'd': 'days', 'day': 'days', 'days': 'days',
+    'w': 'weeks', 'week': 'weeks', 'weeks': 'weeks',
+}
+
+
+def _fast_reltime(time_expr: str) -> Optional[timedelta]:
+    """Parse "<ASCII digits><unit>" without regex, returns None if the input doesn't fit."""
+    i = 0
+    while i < len(time_expr) and '0' <= time_expr[i] <= '9':
+        i += 1
+    if i == 0:
+        return None
+
+    unit = _TIME_UNITS.get(time_expr[i:].strip())
+    if unit is None:
+        return None
+
+    return timedelta(**{unit: int(time_expr[:i])})
+
+
+def _logql_string(value: str) -> str:
+    """Escape a value for use inside a double-quoted LogQL string."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+# Upper bound on a single ignore alternation; longer lists are split into chunks
+_MAX_IGNORE_FILTER_LENGTH = 4096
+
+# Characters that make an ignore signature a regex rather than a plain substring
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+def _is_literal_signature(signature: str) -> bool:
+    """True if the signature has no regex metacharacters and can use a `!=` filter."""
+    return not any(c in _REGEX_METACHARACTERS for c in signature)
+
+
+def _build_ignore_query(ignore_list: List[Dict]) -> str:
+    """
+    Build the LogQL line filters that drop ignored lines on the Loki side.
+
+    Literal signatures become `!= "..."` substring filters (no regex engine);
+    the rest are merged into as few `!~` alternations as possible.
+
+    Loki applies line filters left to right and stops at the first one that
+    drops a line, so the order is: search term first (set by search_logs, the
+    most selective), then the cheap literal filters, then the regex ones.
+    Per-signature hit counts can't drive the order because dropped lines
+    never reach the client.
+    """
+    literal = []
+    regex = []
+    seen = set()
+    for entry in ignore_list:
+        # Re-activated entries can repeat a signature; send each pattern once
+        signature = entry['log_signature']
+        if signature in seen:
+            continue
+        seen.add(signature)
+
+        if _is_literal_signature(signature):
+            literal.append(entry)
+        else:
+            regex.append(entry)
+
+    query_parts = [f' != "{_logql_string(entry["log_signature"])}"' for entry in literal]
+    query_parts.extend(
+        f' !~ "{_logql_string(ignore_filter)}"' for ignore_filter in _build_ignore_filters(regex)
+    )
+
+    return ''.join(query_parts)
+
+
+def _build_ignore_filters(ignore_list: List[Dict]) -> List[str]:
+    """
+    Merge ignore signatures into as few regex alternations as possible.
+
+    Loki evaluates one `!~` filter per line per pass, so a single
+    "(?:a)|(?:b)" filter is much cheaper than one filter per signature.
+    """
+    filters = []
+    current = []
+    current_length = 0
+
+    for entry in ignore_list:
+        part = f'(?:{entry["log_signature"]})'
+        if current and current_length + len(part) + 1 > _MAX_IGNORE_FILTER_LENGTH:
+            filters.append('|'.join(current))
+            current = []
+            current_length = 0
+        current.append(part)
+        current_length += len(part) + 1
+
+    if current:
+        filters.append('|'.join(current))
+
+    return filters
+
+
+class LogEntry(NamedTuple):
+    """A single log line returned by search_logs."""
+
+    timestamp_ns: int
+    labels: Dict
+    message: str
+    namespace: str
+    pod: str
+    container: str
+    app: str
+    level: str
+
+    @property
+    def timestamp(self) -> datetime:
+        """Local datetime for the entry's nanosecond timestamp."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000)
+
+    def to_json_dict(self) -> Dict:
+        """Dict representation used for JSON output."""
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'labels': self.labels,
+            'message': self.message,
+            'namespace': self.namespace,
+            'pod': self.pod,
+            'container': self.container,
+            'app': self.app,
+            'level': self.level,
+        }
+
+
 class LokiClient:
     """Client for interacting with Loki API."""
 
@@ -18,6 +170,23 @@ class LokiClient:
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
 
+        # Keep connections alive and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+
+        # Number of entries matched by the last search_logs call
+        self.last_match_count = 0
+
+        # Optional ResultCache; when set, query_range snaps its time window to
+        # whole minutes and serves repeated queries from disk
+        self.result_cache = None
+
         # Set timeout for requests
         self.session.timeout = 30
 
@@ -30,10 +199,17 @@ class LokiClient:
         - "30 minutes ago"
         - "2 days ago"
         - "1h ago", "30m ago", "2d ago"
+        - Short forms without "ago": "1h", "30m", "2d"
         - Absolute timestamps: "2024-01-01T00:00:00Z"
         """
         time_expr = time_expr.strip().lower()
 
+        # Fast path for the common "1h" / "30 minutes ago" forms
+        relative_expr = time_expr[:-3] if time_expr.endswith('ago') else time_expr
+        delta = _fast_reltime(relative_expr.strip())
+        if delta is not None:
+            return datetime.now() - delta
+
         # Handle absolute timestamps first
         if not time_expr.endswith('ago'):
             try:
@@ -45,16 +221,8 @@ class LokiClient:
         time_expr = time_expr.replace('ago', '').strip()
 
         # Extract number and unit
-        patterns = [
-            (r'(\d+)\s*h(?:our)?s?', 'hours'),
-            (r'(\d+)\s*m(?:in(?:ute)?)?s?', 'minutes'),
-            (r'(\d+)\s*s(?:ec(?:ond)?)?s?', 'seconds'),
-            (r'(\d+)\s*d(?:ay)?s?', 'days'),
-            (r'(\d+)\s*w(?:eek)?s?', 'weeks'),
-        ]
-
-        for pattern, unit in patterns:
-            match = re.search(pattern, time_expr)
+        for pattern, unit in _TIME_PATTERNS:
+            match = pattern.search(time_expr)
             if match:
                 value = int(match.group(1))
                 delta_kwargs = {unit: value}
@@ -81,7 +249,20 @@ class LokiClient:
             Dict containing Loki API response
         """
         if end_time is None:
-            end_time = datetime.utcnow()
+            # Aware, so timestamp() is right whatever the local timezone
+            end_time = datetime.now(timezone.utc)
+
+        cache = self.result_cache
+        if cache is not None:
+            start_time = start_time.replace(second=0, microsecond=0)
+            end_time = end_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            cache_key = cache.make_key(
+                self.base_url, query.strip(),
+                self._format_timestamp(start_time), self._format_timestamp(end_time), limit
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         # Build query parameters
         params = {
@@ -100,21 +281,43 @@ class LokiClient:
             response = self.session.get(url, params=params)
             response.raise_for_status()
 
-            return response.json()
+            result = orjson.loads(response.content)
+            if cache is not None:
+                cache.set(cache_key, result)
+            return result
 
         except requests.exceptions.RequestException as e:
             if not getattr(self, '_silent_mode', False):
                 logger.error(f"Failed to query Loki: {e}")
             raise click.ClickException(f"Failed to connect to Loki at {self.base_url}: {e}")
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             if not getattr(self, '_silent_mode', False):
                 logger.error(f"Invalid JSON response from Loki: {e}")
             raise click.ClickException(f"Invalid response from Loki: {e}")
 
+    def _stream_fields(self, labels: Dict) -> Tuple:
+        """
+        Derive the per-entry label fields once for a whole stream.
+
+        Returns (labels, namespace, pod, container, app, level) in LogEntry order.
+        """
+        # Extract pod name from labels - fluent-bit maps pod_name to 'instance'
+        pod_name = labels.get('pod') or labels.get('instance', 'unknown')
+
+        return (
+            labels,
+            labels.get('namespace', 'unknown'),
+            pod_name,
+            labels.get('container', 'unknown'),
+            labels.get('app', 'unknown'),
+            labels.get('detected_level', labels.get('level', 'unknown')),
+        )
+
     def search_logs(self, search_term: str, since: str = "1h", limit: int = 100,
                    namespace: Optional[str] = None, pod: Optional[str] = None,
                    app: Optional[str] = None,
-                   ignore_list: Optional[List[Dict]] = None, debug: bool = False) -> List[Dict]:
+                   ignore_list: Optional[List[Dict]] = None, debug: bool = False,
+                   top_n: Optional[int] = None, case_sensitive: bool = False) -> List[LogEntry]:
         """
         Search logs for a specific term with optional filters.
 
@@ -122,13 +325,18 @@ class LokiClient:
             search_term: Text to search for in logs
             since: Time range to search (e.g., "1h", "30m", "1 day ago")
             limit: Maximum number of results
-            namespace: Kubernetes namespace filter
+            namespace: Kubernetes namespace filter (comma-separated for several)
             pod: Pod name filter
             app: App label filter
             ignore_list: List of active ignore entries to exclude from search
+            top_n: Only return the N most recent entries (e.g. when the caller
+                   displays a fixed number of rows)
+            case_sensitive: Match search_term exactly with a substring filter
+                   instead of a case-insensitive regex
 
         Returns:
-            List of log entries
+            List of LogEntry, most recent first. The number of entries
+            before top_n was applied is stored in self.last_match_count.
         """
         # Build LogQL query
         query_parts = []
@@ -139,9 +347,14 @@ class LokiClient:
         # Always include job filter as base
         selector_filters.append('job=~".+"')
 
-        # Add namespace filter
+        # Add namespace filter; several comma-separated namespaces are matched
+        # by one regex selector instead of one query per namespace
         if namespace:
-            selector_filters.append(f'namespace="{namespace}"')
+            namespaces = [ns.strip() for ns in namespace.split(',') if ns.strip()]
+            if len(namespaces) > 1:
+                selector_filters.append(f'namespace=~"{"|".join(namespaces)}"')
+            elif namespaces:
+                selector_filters.append(f'namespace="{namespaces[0]}"')
 
         # Add pod filter - try instance first (more common in fluent-bit logs)
         if pod:
@@ -159,16 +372,22 @@ class LokiClient:
         if search_term:
             # Special case: if search term is just ".", don't add a filter (match all)
             if search_term != ".":
-                # Use regex filter for case-insensitive search
-                escaped_term = re.escape(search_term)
-                query_parts.append(f' |~ "(?i){escaped_term}"')
+                if case_sensitive or not any(c.isalpha() for c in search_term):
+                    # Plain substring match is much cheaper for Loki than a regex
+                    query_parts.append(f' |= "{_logql_string(search_term)}"')
+                else:
+                    # Use regex filter for case-insensitive search
+                    escaped_term = _logql_string(re.escape(search_term))
+                    query_parts.append(f' |~ "(?i){escaped_term}"')
 
         if ignore_list:
-            for entry in ignore_list:
-                query_parts.append(f' !~ "{entry["log_signature"]}"')
+            query_parts.append(_build_ignore_query(ignore_list))
 
         query = ''.join(query_parts)
 
+        # Catch malformed queries locally instead of with a 400 from Loki
+        validate_logql(query)
+
         # Parse time range
         start_time = self._parse_time_expression(since)
 
@@ -181,36 +400,43 @@ class LokiClient:
         # Execute query
         result = self.query_range(query, start_time, limit=limit)
 
-        # Extract and format log entries
-        log_entries = []
+        # Keep only the k most recent lines in a bounded min-heap while walking
+        # the streams, and build entry dicts just for the survivors
+        k = top_n if top_n is not None else limit
+        heap = []
+        match_count = 0
+        seq = 0
 
-        if result.get('status') == 'success':
+        if result.get('status') == 'success' and k > 0:
             data = result.get('data', {})
             streams = data.get('result', [])
 
             for stream in streams:
                 labels = stream.get('stream', {})
                 values = stream.get('values', [])
+                match_count += len(values)
+
+                # Label-derived fields are the same for every line in a stream
+                stream_fields = self._stream_fields(labels)
 
                 for timestamp_ns, log_line in values:
-                    # Convert nanosecond timestamp to datetime
-                    timestamp = datetime.fromtimestamp(int(timestamp_ns) / 1_000_000_000)
-
-                    # Extract pod name from labels - fluent-bit maps pod_name to 'instance'
-                    pod_name = labels.get('pod') or labels.get('instance', 'unknown')
-
-                    log_entries.append({
-                        'timestamp': timestamp,
-                        'labels': labels,
-                        'message': log_line,
-                        'namespace': labels.get('namespace', 'unknown'),
-                        'pod': pod_name,
-                        'container': labels.get('container', 'unknown'),
-                        'app': labels.get('app', 'unknown'),
-                        'level': labels.get('detected_level', labels.get('level', 'unknown')),
-                    })
+                    # seq breaks timestamp ties so label dicts are never compared
+                    item = (int(timestamp_ns), seq, log_line, stream_fields)
+                    seq += 1
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+
+        self.last_match_count = match_count
 
         # Sort by timestamp (most recent first)
-        log_entries.sort(key=lambda x: x['timestamp'], reverse=True)
+        log_entries = []
+        for timestamp_ns, _, log_line, stream_fields in sorted(heap, reverse=True):
+            # Timestamps stay as int nanoseconds; converted only when displayed
+            labels, namespace, pod, container, app, level = stream_fields
+            log_entries.append(LogEntry(
+                timestamp_ns, labels, log_line, namespace, pod, container, app, level
+            ))
 
         return log_entries
@@ -1,13 +1,15 @@
 """Helper functions for Loki CLI commands."""
 
-import json
 import re
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
+import orjson
 
 from todops.loki.config import get_minio_config
-from todops.loki.ignore_manager import LokiIgnoreManager
+
+if TYPE_CHECKING:
+    from todops.loki.ignore_manager import LokiIgnoreManager
 
 
 def is_quiet_mode(output_format: str) -> bool:
@@ -15,16 +17,24 @@ def is_quiet_mode(output_format: str) -> bool:
     return output_format in ['json', 'raw']
 
 
-def load_ignore_list(output_format: str) -> Optional[list]:
-    """Load active ignore list from MinIO, returns None on failure."""
+def load_ignore_list(output_format: str,
+                     manager: Optional['LokiIgnoreManager'] = None) -> Optional[list]:
+    """
+    Load active ignore list from MinIO.
+
+    Returns None on failure or when there are no active entries, so callers
+    can skip building ignore filters altogether.
+    """
     try:
-        config = get_minio_config()
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
-        return manager.list_entries(active_only=True)
+        if manager is None:
+            from todops.loki.ignore_manager import LokiIgnoreManager
+            config = get_minio_config()
+            manager = LokiIgnoreManager(
+                config['url'],
+                config['access_key'],
+                config['secret_key']
+            )
+        return manager.list_entries(active_only=True) or None
     except Exception as e:
         if not is_quiet_mode(output_format):
             click.echo(f"Warning: Could not load ignore list: {e}", err=True)
@@ -43,38 +53,72 @@ def handle_empty_results(output_format: str):
 
 def output_json(log_entries: list):
     """Output log entries in JSON format."""
-    json_entries = [
-        {**entry, 'timestamp': entry['timestamp'].isoformat()}
-        for entry in log_entries
-    ]
-    click.echo(json.dumps(json_entries, indent=2))
+    json_entries = [entry.to_json_dict() for entry in log_entries]
+    click.echo(orjson.dumps(json_entries, option=orjson.OPT_INDENT_2).decode('utf-8'))
 
 
 def output_raw(log_entries: list):
-    """Output log entries in raw format."""
-    for entry in log_entries:
-        namespace_prefix = f"[{entry['namespace']}/{entry['labels'].get('app', 'unknown')}] "
-        click.echo(f"{namespace_prefix}{entry['message']}")
+    """Output log entries in raw format, written to stdout in a single call."""
+    lines = [
+        f"[{entry.namespace}/{entry.labels.get('app', 'unknown')}] {entry.message}"
+        for entry in log_entries
+    ]
+    if lines:
+        click.echo('\n'.join(lines))
 
 
 def highlight_search_term(message: str, search_term: str) -> str:
     """Highlight search term in message with brackets."""
-    if search_term.lower() in message.lower():
+    if not search_term:
+        return message
+
+    lower_message = message.lower()
+    needle = search_term.lower()
+
+    j = lower_message.find(needle)
+    if j == -1:
+        return message
+
+    # Lowercasing can change the length of some characters; indices would drift
+    if len(lower_message) != len(message):
         pattern = re.compile(re.escape(search_term), re.IGNORECASE)
         return pattern.sub(f'[{search_term.upper()}]', message)
-    return message
 
+    replacement = f'[{search_term.upper()}]'
+    parts = []
+    i = 0
+    while j != -1:
+        parts.append(message[i:j])
+        parts.append(replacement)
+        i = j + len(needle)
+        j = lower_message.find(needle, i)
+    parts.append(message[i:])
+
+    return ''.join(parts)
+
+
+# Number of entries shown in table mode
+TABLE_DISPLAY_LIMIT = 50
+
+
+def output_table(log_entries: list, search_term: str, total: Optional[int] = None):
+    """
+    Output log entries in table format.
+
+    total is the number of matching entries when log_entries was already
+    trimmed to TABLE_DISPLAY_LIMIT; defaults to len(log_entries).
+    """
+    if total is None:
+        total = len(log_entries)
 
-def output_table(log_entries: list, search_term: str):
-    """Output log entries in table format."""
     click.echo("Recent log entries:")
     click.echo()
 
     for i, entry in enumerate(log_entries, 1):
-        timestamp_str = entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-        pod_name = entry['pod'][:20] if entry['pod'] != 'unknown' else 'unknown'
+        timestamp_str = entry.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        pod_name = entry.pod[:20] if entry.pod != 'unknown' else 'unknown'
 
-        message = highlight_search_term(entry['message'], search_term)
+        message = highlight_search_term(entry.message, search_term)
 
         # Truncate long messages
         if len(message) > 100:
@@ -82,8 +126,9 @@ def output_table(log_entries: list, search_term: str):
 
         click.echo(f"{i:3d}. {timestamp_str} [{pod_name:20s}] {message}")
 
-        if i >= 50:  # Limit display to 50 entries in table mode
-            remaining = len(log_entries) - 50
-            if remaining > 0:
-                click.echo(f"\n... and {remaining} more entries (use --format json to see all)")
+        if i >= TABLE_DISPLAY_LIMIT:  # Limit display in table mode
             break
+
+    remaining = total - min(len(log_entries), TABLE_DISPLAY_LIMIT)
+    if remaining > 0:
+        click.echo(f"\n... and {remaining} more entries (use --format json to see all)")
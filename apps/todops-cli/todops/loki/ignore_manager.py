@@ -1,18 +1,91 @@
 """Loki ignore list manager for MinIO storage."""
 
-import json
 import logging
+import os
 import re
+import time
 import uuid
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import certifi
+import orjson
+import urllib3
 from minio import Minio
-from minio.error import S3Error
+from minio.error import S3Error, ServerError
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Last downloaded ignore list and its ETag, shared between CLI invocations
+DEFAULT_CACHE_FILE = Path.home() / '.cache' / 'todops' / 'ignore_list.json'
+
+# Duration like "7 days" or "3h"; the named group that matched gives the unit.
+# \b keeps e.g. "month" from matching the minutes alternative "m".
+_DURATION_RE = re.compile(
+    r'(\d+)\s*(?:'
+    r'(?P<minutes>minutes?|mins?|m)|'
+    r'(?P<hours>hours?|hrs?|h)|'
+    r'(?P<days>days?|d)|'
+    r'(?P<weeks>weeks?|w)|'
+    r'(?P<months>months?|mo)'
+    r')\b'
+)
+
+_DURATION_UNITS = {
+    'minutes': lambda value: timedelta(minutes=value),
+    'hours': lambda value: timedelta(hours=value),
+    'days': lambda value: timedelta(days=value),
+    'weeks': lambda value: timedelta(weeks=value),
+    'months': lambda value: timedelta(days=value * 30),  # Approximate months as 30 days
+}
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> urllib3.PoolManager:
+    """
+    Connection pool shared by every LokiIgnoreManager in the process.
+
+    Mirrors minio's default pool, with timeouts suited to an interactive CLI
+    instead of minio's five minutes.
+    """
+    return urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=10, read=60),
+        maxsize=8,
+        block=False,
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+        retries=Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as a naive ISO string, the format used for created_at/updated_at."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _parse_expire_date(value: str) -> datetime:
+    """Parse a stored expire_date; naive values are treated as UTC."""
+    expire_date = datetime.fromisoformat(value)
+    if expire_date.tzinfo is None:
+        expire_date = expire_date.replace(tzinfo=timezone.utc)
+    return expire_date
+
+
+@lru_cache(maxsize=1024)
+def _expire_ts(expire_date: str) -> float:
+    """
+    Epoch seconds for a stored expire_date, parsed once per distinct value.
+
+    expire_date is the only stored expiry field, since older todops versions
+    sharing the same object only ever rewrite that one.
+    """
+    return _parse_expire_date(expire_date).timestamp()
+
 
 class LokiIgnoreManager:
     """Manager for Loki ignore list stored in MinIO."""
@@ -20,8 +93,14 @@ class LokiIgnoreManager:
     BUCKET_NAME = "tools"
     OBJECT_NAME = "loki-ignore.json"
 
-    def __init__(self, minio_url: str, access_key: str, secret_key: str, secure: bool = False):
-        """Initialize MinIO client for ignore list management."""
+    def __init__(self, minio_url: str, access_key: str, secret_key: str, secure: bool = False,
+                 cache_file: Optional[Path] = None):
+        """
+        Initialize MinIO client for ignore list management.
+
+        If cache_file is given, the last downloaded list is kept there so a
+        new process only needs a HEAD request while the ETag is unchanged.
+        """
         # Parse MinIO URL to extract host and port
         url = minio_url.replace('http://', '').replace('https://', '')
         if ':' in url:
@@ -30,15 +109,25 @@ class LokiIgnoreManager:
         else:
             endpoint = url
 
+        self.endpoint = endpoint
+        self.cache_file = cache_file
+
         self.client = Minio(
             endpoint,
             access_key=access_key,
             secret_key=secret_key,
-            secure=secure
+            secure=secure,
+            http_client=_shared_http_client()
         )
 
-        # Ensure bucket exists
-        self._ensure_bucket()
+        # (etag, ignore_list) of the last list read from or written to MinIO
+        self._cache: Optional[Tuple[str, List[Dict]]] = None
+
+        # Working copy of the ignore list while a batch() is open
+        self._batch: Optional[List[Dict]] = None
+        self._batch_dirty = False
+
+        # The bucket is created lazily on the first save (see _save_ignore_list)
 
     def _ensure_bucket(self):
         """Ensure the tools bucket exists."""
@@ -63,79 +152,146 @@ class LokiIgnoreManager:
         """
         duration_str = duration_str.strip().lower()
 
-        # Regular expression patterns for duration parsing
-        patterns = [
-            (r'(\d+)\s*(?:minute|minutes|min|mins|m)', 'minutes'),
-            (r'(\d+)\s*(?:hour|hours|hr|hrs|h)', 'hours'),
-            (r'(\d+)\s*(?:day|days|d)', 'days'),
-            (r'(\d+)\s*(?:week|weeks|w)', 'weeks'),
-            (r'(\d+)\s*(?:month|months|mo)', 'days', 30),  # Approximate months as 30 days
-        ]
-
-        for pattern_info in patterns:
-            if len(pattern_info) == 2:
-                pattern, unit = pattern_info
-                multiplier = 1
-            else:
-                pattern, unit, multiplier = pattern_info
-
-            match = re.search(pattern, duration_str)
-            if match:
-                value = int(match.group(1))
-                if unit == 'weeks':
-                    delta = timedelta(weeks=value)
-                elif unit == 'days':
-                    delta = timedelta(days=value * multiplier)
-                elif unit == 'hours':
-                    delta = timedelta(hours=value)
-                elif unit == 'minutes':
-                    delta = timedelta(minutes=value)
-                else:
-                    raise ValueError(f"Unknown time unit: {unit}")
-
-                return datetime.now(timezone.utc) + delta
-
-        raise ValueError(f"Unable to parse duration: {duration_str}")
+        match = _DURATION_RE.search(duration_str)
+        if not match:
+            raise ValueError(f"Unable to parse duration: {duration_str}")
+
+        delta = _DURATION_UNITS[match.lastgroup](int(match.group(1)))
+        return datetime.now(timezone.utc) + delta
 
     def _load_ignore_list(self) -> List[Dict]:
-        """Load the current ignore list from MinIO."""
+        """
+        Load the current ignore list from MinIO.
+
+        When a copy is cached, the GET is conditional on its ETag
+        (If-None-Match); MinIO answers 304 without a body while the list is
+        unchanged, and the cached copy is returned.
+        """
+        if self._batch is not None:
+            return self._batch
+
         try:
-            response = self.client.get_object(self.BUCKET_NAME, self.OBJECT_NAME)
+            if self._cache is None:
+                self._cache = self._read_cache_file()
+
+            request_headers = None
+            if self._cache is not None:
+                request_headers = {'If-None-Match': f'"{self._cache[0]}"'}
+
+            try:
+                response = self.client.get_object(
+                    self.BUCKET_NAME, self.OBJECT_NAME, request_headers=request_headers
+                )
+            except ServerError as e:
+                if e.status_code == 304 and self._cache is not None:
+                    return [dict(entry) for entry in self._cache[1]]
+                raise
             data = response.read()
+            etag = (response.headers.get('ETag') or '').replace('"', '')
             response.close()
             response.release_conn()
 
-            return json.loads(data.decode('utf-8'))
+            ignore_list = orjson.loads(data)
+            self._set_cache(etag, ignore_list)
+            return [dict(entry) for entry in ignore_list]
         except S3Error as e:
-            if e.code == 'NoSuchKey':
-                # File doesn't exist yet, return empty list
+            if e.code in ('NoSuchKey', 'NoSuchBucket'):
+                # File or bucket doesn't exist yet, return empty list
+                self._cache = None
                 return []
             else:
                 logger.error(f"Failed to load ignore list: {e}")
                 raise
 
     def _save_ignore_list(self, ignore_list: List[Dict]):
-        """Save the ignore list to MinIO."""
+        """Save the ignore list to MinIO (deferred until the end of an open batch)."""
+        if self._batch is not None:
+            self._batch = ignore_list
+            self._batch_dirty = True
+            return
+
         try:
-            # Convert to JSON
-            json_data = json.dumps(ignore_list, indent=2, default=str)
-            json_bytes = json_data.encode('utf-8')
-
-            # Upload to MinIO
-            self.client.put_object(
-                self.BUCKET_NAME,
-                self.OBJECT_NAME,
-                BytesIO(json_bytes),
-                length=len(json_bytes),
-                content_type='application/json'
-            )
+            # Compact JSON; the object is only read by todops
+            json_bytes = orjson.dumps(ignore_list, default=str)
+
+            # Upload to MinIO, creating the bucket on the first write
+            try:
+                result = self._put_ignore_list(json_bytes)
+            except S3Error as e:
+                if e.code != 'NoSuchBucket':
+                    raise
+                self._ensure_bucket()
+                result = self._put_ignore_list(json_bytes)
+            self._set_cache(result.etag, [dict(entry) for entry in ignore_list])
 
             logger.info(f"Saved ignore list with {len(ignore_list)} entries")
         except S3Error as e:
             logger.error(f"Failed to save ignore list: {e}")
             raise
 
-    def add_ignore_entry(self, log_signature: str, duration: str) -> str:
+    def _set_cache(self, etag: str, ignore_list: List[Dict]):
+        """Remember the list for etag in memory and, if enabled, in cache_file."""
+        self._cache = (etag, ignore_list)
+        if self.cache_file is None:
+            return
+
+        payload = {'endpoint': self.endpoint, 'etag': etag, 'ignore_list': ignore_list}
+        tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(payload, default=str))
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write ignore list cache {self.cache_file}: {e}")
+
+    def _read_cache_file(self) -> Optional[Tuple[str, List[Dict]]]:
+        """Return (etag, ignore_list) from cache_file if it was written for this endpoint."""
+        if self.cache_file is None:
+            return None
+        try:
+            payload = orjson.loads(self.cache_file.read_bytes())
+            if payload['endpoint'] != self.endpoint:
+                return None
+            return payload['etag'], payload['ignore_list']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _put_ignore_list(self, json_bytes: bytes):
+        """Upload serialized ignore list bytes to MinIO."""
+        return self.client.put_object(
+            self.BUCKET_NAME,
+            self.OBJECT_NAME,
+            BytesIO(json_bytes),
+            length=len(json_bytes),
+            content_type='application/json'
+        )
+
+    @contextmanager
+    def batch(self) -> Iterator['LokiIgnoreManager']:
+        """
+        Group several changes into one read and one write of the ignore list.
+
+        Changes made inside the block are uploaded with a single put_object
+        when it exits; nothing is written if the block raises.
+        """
+        if self._batch is not None:
+            # Nested batches join the outer one
+            yield self
+            return
+
+        self._batch = self._load_ignore_list()
+        self._batch_dirty = False
+        try:
+            yield self
+            ignore_list, dirty = self._batch, self._batch_dirty
+        finally:
+            self._batch = None
+            self._batch_dirty = False
+
+        if dirty:
+            self._save_ignore_list(ignore_list)
+
+    def add_ignore_entry(self, log_signature: str, duration: str) -> Tuple[str, datetime]:
         """
         Add a new entry to the ignore list.
 
@@ -144,41 +300,42 @@ class LokiIgnoreManager:
             duration: Duration string (e.g., "7 days")
 
         Returns:
-            The ID of the created entry
+            The ID of the created or updated entry and its expiry date
         """
         # Load current list
         ignore_list = self._load_ignore_list()
 
         # Parse duration to get expiry date
         expire_date = self._parse_duration(duration)
-
-        # Create new entry
-        entry_id = str(uuid.uuid4())
-        new_entry = {
-            'id': entry_id,
-            'log_signature': log_signature,
-            'expire_date': expire_date.isoformat(),
-            'status': 'active',
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
+        expire_iso = expire_date.isoformat()
+        now_iso = _utc_now_iso()
 
         # Check if signature already exists
         for entry in ignore_list:
             if entry['log_signature'] == log_signature and entry['status'] == 'active':
                 # Update existing entry instead
-                entry['expire_date'] = expire_date.isoformat()
-                entry['updated_at'] = datetime.utcnow().isoformat()
+                entry['expire_date'] = expire_iso
+                # Written by earlier versions; expire_date is authoritative
+                entry.pop('expire_ts', None)
+                entry['updated_at'] = now_iso
                 self._save_ignore_list(ignore_list)
-                return entry['id']
+                return entry['id'], expire_date
 
         # Add new entry
-        ignore_list.append(new_entry)
+        entry_id = str(uuid.uuid4())
+        ignore_list.append({
+            'id': entry_id,
+            'log_signature': log_signature,
+            'expire_date': expire_iso,
+            'status': 'active',
+            'created_at': now_iso,
+            'updated_at': now_iso
+        })
 
         # Save updated list
         self._save_ignore_list(ignore_list)
 
-        return entry_id
+        return entry_id, expire_date
 
     def delete_entry(self, entry_id: str) -> bool:
         """
@@ -192,13 +349,12 @@ class LokiIgnoreManager:
         """
         ignore_list = self._load_ignore_list()
 
-        # Find and remove entry
-        original_length = len(ignore_list)
-        ignore_list = [e for e in ignore_list if e['id'] != entry_id]
-
-        if len(ignore_list) < original_length:
-            self._save_ignore_list(ignore_list)
-            return True
+        # Remove the entry in place; IDs are unique, so stop at the first match
+        for i, entry in enumerate(ignore_list):
+            if entry['id'] == entry_id:
+                del ignore_list[i]
+                self._save_ignore_list(ignore_list)
+                return True
 
         return False
 
@@ -218,7 +374,7 @@ class LokiIgnoreManager:
         for entry in ignore_list:
             if entry['id'] == entry_id:
                 entry['status'] = status
-                entry['updated_at'] = datetime.utcnow().isoformat()
+                entry['updated_at'] = _utc_now_iso()
                 self._save_ignore_list(ignore_list)
                 return True
 
@@ -236,22 +392,22 @@ class LokiIgnoreManager:
         """
         ignore_list = self._load_ignore_list()
 
-        # Clean up expired entries
-        now = datetime.now()
-        cleaned_list = []
+        # Expire entries and pick the ones to return in one pass. Any entry
+        # past its expiry is marked expired, whatever its status.
+        now_ts = time.time()
+        newly_expired = False
+        entries = []
 
         for entry in ignore_list:
-            expire_date = datetime.fromisoformat(entry['expire_date'])
-            if expire_date < now:
-                # Mark as expired
+            if entry['status'] != 'expired' and _expire_ts(entry['expire_date']) < now_ts:
                 entry['status'] = 'expired'
-            cleaned_list.append(entry)
+                newly_expired = True
+            if not active_only or entry['status'] == 'active':
+                entries.append(entry)
 
-        # Save if we marked any as expired
-        if any(e['status'] == 'expired' for e in cleaned_list):
-            self._save_ignore_list(cleaned_list)
-
-        if active_only:
-            return [e for e in cleaned_list if e['status'] == 'active']
+        # Save only if this call expired something; entries expired earlier
+        # are already stored that way
+        if newly_expired:
+            self._save_ignore_list(ignore_list)
 
-        return cleaned_list
+        return entries
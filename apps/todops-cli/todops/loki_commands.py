@@ -5,15 +5,20 @@ Loki CLI commands for todops.
 This module provides commands for interacting with Loki log aggregation system.
 """
 
+import functools
 import logging
 import os
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import click
 
-from todops.loki.client import LokiClient
+from todops._envcache import ensure_env
+from todops.context import get_ignore_manager, get_loki_client
+from todops.loki._result_cache import DEFAULT_TTL
+from todops.loki.config import get_minio_config
 from todops.loki.helpers import (
+    TABLE_DISPLAY_LIMIT,
     is_quiet_mode,
     load_ignore_list,
     handle_empty_results,
@@ -22,27 +27,38 @@ from todops.loki.helpers import (
     output_table,
 )
 
+if TYPE_CHECKING:
+    from todops.loki.client import LokiClient
+
 logger = logging.getLogger(__name__)
 
 
 @click.group()
 def loki():
     """Loki log search and analysis commands."""
-    pass
+    ensure_env()
 
 @loki.command()
 @click.argument('search_term', required=True)
 @click.option('--since', '-s', default='1h', help='Time range to search (e.g., "1h", "30m", "2 days ago")')
 @click.option('--limit', '-l', default=1000, type=int, help='Maximum number of log entries to return')
-@click.option('--namespace', '-n', help='Filter by Kubernetes namespace')
+@click.option('--namespace', '-n', help='Filter by Kubernetes namespace (comma-separated for several)')
 @click.option('--pod', '-p', help='Filter by pod name (supports partial matching)')
 @click.option('--app', '-a', help='Filter by app label')
 @click.option('--format', '-o', 'output_format', default='raw', type=click.Choice(['table', 'json', 'raw']), help='Output format')
 @click.option('--no-ignore', is_flag=True, help='Disable ignore list filtering')
+@click.option('--case-sensitive', is_flag=True, help='Match SEARCH_TERM exactly (faster substring filter)')
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse the result of an identical search run in the same minute, within '
+                   '--cache-ttl; logs that arrived since are not shown (default: always query Loki)')
+@click.option('--cache-ttl', default=DEFAULT_TTL, type=int, show_default=True,
+              help='Seconds a cached result stays valid with --cache')
 @click.option('--debug', is_flag=True, help='Show the LogQL query being executed')
-def search(search_term: str, since: str, limit: int, namespace: Optional[str],
+@click.pass_context
+def search(ctx: click.Context, search_term: str, since: str, limit: int, namespace: Optional[str],
            pod: Optional[str], app: Optional[str],
-           output_format: str, no_ignore: bool, debug: bool):
+           output_format: str, no_ignore: bool, case_sensitive: bool,
+           cache: bool, cache_ttl: int, debug: bool):
     """Search logs in Loki for a specific term.
 
     SEARCH_TERM: Text to search for in log messages
@@ -52,26 +68,36 @@ def search(search_term: str, since: str, limit: int, namespace: Optional[str],
       todops loki search "error"
       todops loki search "failed" --since "2 hours ago"
       todops loki search "timeout" --namespace tools --limit 50
+      todops loki search "timeout" --namespace tools,todo
       todops loki search "exception" --pod todopsbot --format json
+      todops loki search "OOMKilled" --case-sensitive
+      todops loki search "error" --since "1 day ago" --cache
     """
-    url = get_loki_url()
+    client = get_loki_client(ctx, get_loki_url())
+    if cache:
+        from todops.loki._result_cache import ResultCache
+        client.result_cache = ResultCache(ttl=cache_ttl)
+    else:
+        client.result_cache = None
 
-    ignore_list = load_ignore_list(output_format) if not no_ignore else None
+    ignore_list = None
+    if not no_ignore:
+        ignore_list = load_ignore_list(output_format, _get_search_ignore_manager(ctx, output_format))
     if debug:
         click.echo(f"ignore_list: {ignore_list}\n")
 
     # Search logs
     try:
-        log_entries = _perform_search(
-            url, output_format, search_term, since, limit,
-            namespace, pod, app, ignore_list, debug
+        log_entries, total = _perform_search(
+            client, output_format, search_term, since, limit,
+            namespace, pod, app, ignore_list, debug, case_sensitive
         )
     except Exception as e:
         _handle_search_error(e, output_format)
         return
 
     if debug:
-        click.echo(f"Found {len(log_entries)} log entries\n")
+        click.echo(f"Found {total} log entries\n")
         return
 
     if not log_entries:
@@ -83,18 +109,29 @@ def search(search_term: str, since: str, limit: int, namespace: Optional[str],
     elif output_format == 'raw':
         output_raw(log_entries)
     else:
-        output_table(log_entries, search_term)
+        output_table(log_entries, search_term, total)
+
+
+def _get_search_ignore_manager(ctx: click.Context, output_format: str):
+    """Shared ignore manager for search, or None so load_ignore_list reports the error."""
+    try:
+        return get_ignore_manager(ctx, get_minio_config())
+    except Exception:
+        return None
 
 
-def _perform_search(url: str, output_format: str, search_term: str,
+def _perform_search(client: 'LokiClient', output_format: str, search_term: str,
                    since: str, limit: int, namespace: Optional[str],
                    pod: Optional[str], app: Optional[str],
-                   ignore_list: Optional[list], debug: bool) -> list:
-    """Perform the actual log search with appropriate progress indication."""
-    client = LokiClient(url)
+                   ignore_list: Optional[list], debug: bool,
+                   case_sensitive: bool = False) -> Tuple[list, int]:
+    """
+    Run the log search with client messages silenced.
 
+    Returns the entries to display and the total number of matches.
+    """
     client._silent_mode = True
-    return client.search_logs(
+    log_entries = client.search_logs(
         search_term=search_term,
         since=since,
         limit=limit,
@@ -102,8 +139,12 @@ def _perform_search(url: str, output_format: str, search_term: str,
         pod=pod,
         app=app,
         ignore_list=ignore_list,
-        debug=debug
+        debug=debug,
+        case_sensitive=case_sensitive,
+        # Table output only shows the most recent entries
+        top_n=TABLE_DISPLAY_LIMIT if output_format == 'table' else None
     )
+    return log_entries, client.last_match_count
 
 def _handle_search_error(error: Exception, output_format: str):
     """Handle search errors appropriately based on output format."""
@@ -115,6 +156,7 @@ def _handle_search_error(error: Exception, output_format: str):
         raise click.ClickException(f"Failed to search logs: {error}")
 
 
+@functools.lru_cache(maxsize=1)
 def get_loki_url() -> str:
     """
     Determine Loki URL with multiple fallback options.
@@ -124,6 +166,10 @@ def get_loki_url() -> str:
     2. Kubernetes internal service (if running in cluster)
     3. Local port-forward assumption
     4. Error if none available
+
+    The result is cached for the process lifetime; tests can reset it with
+    get_loki_url.cache_clear(). LOKI_URL isn't read at import time because
+    .env is only loaded once a command group runs.
     """
     # Check for explicit URL
     explicit_url = os.getenv("LOKI_URL")
@@ -9,12 +9,17 @@ stored in MinIO.
 import json
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import click
+import orjson
 
+from todops._envcache import ensure_env
+from todops.context import get_ignore_manager
 from todops.loki.config import get_minio_config
-from todops.loki.ignore_manager import LokiIgnoreManager
+
+if TYPE_CHECKING:
+    from todops.loki.ignore_manager import LokiIgnoreManager
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +27,15 @@ logger = logging.getLogger(__name__)
 @click.group()
 def ignore():
     """Manage Loki log signature ignore list."""
-    pass
+    ensure_env()
+
+
+def _get_manager(ctx: click.Context, minio_url: Optional[str]) -> 'LokiIgnoreManager':
+    """Return the ignore manager shared by all commands in this process."""
+    config = get_minio_config()
+    if minio_url:
+        config['url'] = minio_url
+    return get_ignore_manager(ctx, config)
 
 
 @ignore.command('set')
@@ -30,7 +43,8 @@ def ignore():
 @click.option('--for', 'duration', default='7 days',
               help='Duration to ignore (e.g., "7 days", "2 weeks", "3 hours")')
 @click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
-def ignore_add(log_signature: str, duration: str, minio_url: Optional[str]):
+@click.pass_context
+def ignore_add(ctx: click.Context, log_signature: str, duration: str, minio_url: Optional[str]):
     """
     Add or update a log signature in the ignore list.
 
@@ -43,19 +57,10 @@ def ignore_add(log_signature: str, duration: str, minio_url: Optional[str]):
         todops loki ignore set "DEBUG: Cache miss" --for "3 hours"
     """
     try:
-        config = get_minio_config()
-        if minio_url:
-            config['url'] = minio_url
-
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
+        manager = _get_manager(ctx, minio_url)
 
-        entry_id = manager.add_ignore_entry(log_signature, duration)
+        entry_id, expire_date = manager.add_ignore_entry(log_signature, duration)
 
-        expire_date = manager._parse_duration(duration)
         click.echo(f"Added ignore entry:")
         click.echo(f"   ID: {entry_id}")
         click.echo(f"   Signature: {log_signature}")
@@ -67,29 +72,24 @@ def ignore_add(log_signature: str, duration: str, minio_url: Optional[str]):
 
 
 @ignore.command('delete')
-@click.argument('entry_id')
+@click.argument('entry_ids', nargs=-1, required=True)
 @click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
-def ignore_delete(entry_id: str, minio_url: Optional[str]):
+@click.pass_context
+def ignore_delete(ctx: click.Context, entry_ids: Tuple[str, ...], minio_url: Optional[str]):
     """
-    Delete an entry from the ignore list.
+    Delete entries from the ignore list.
 
-    ENTRY_ID: The ID of the entry to delete
+    ENTRY_IDS: The IDs of the entries to delete (saved in one write)
     """
     try:
-        config = get_minio_config()
-        if minio_url:
-            config['url'] = minio_url
-
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
-
-        if manager.delete_entry(entry_id):
-            click.echo(f"Deleted entry: {entry_id}")
-        else:
-            click.echo(f"Entry not found: {entry_id}")
+        manager = _get_manager(ctx, minio_url)
+
+        with manager.batch():
+            for entry_id in entry_ids:
+                if manager.delete_entry(entry_id):
+                    click.echo(f"Deleted entry: {entry_id}")
+                else:
+                    click.echo(f"Entry not found: {entry_id}")
 
     except Exception as e:
         logger.error(f"Failed to delete entry: {e}")
@@ -97,29 +97,24 @@ def ignore_delete(entry_id: str, minio_url: Optional[str]):
 
 
 @ignore.command('deactivate')
-@click.argument('entry_id')
+@click.argument('entry_ids', nargs=-1, required=True)
 @click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
-def ignore_deactivate(entry_id: str, minio_url: Optional[str]):
+@click.pass_context
+def ignore_deactivate(ctx: click.Context, entry_ids: Tuple[str, ...], minio_url: Optional[str]):
     """
-    Deactivate an entry in the ignore list.
+    Deactivate entries in the ignore list.
 
-    ENTRY_ID: The ID of the entry to deactivate
+    ENTRY_IDS: The IDs of the entries to deactivate (saved in one write)
     """
     try:
-        config = get_minio_config()
-        if minio_url:
-            config['url'] = minio_url
-
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
-
-        if manager.update_status(entry_id, 'inactive'):
-            click.echo(f"Deactivated entry: {entry_id}")
-        else:
-            click.echo(f"Entry not found: {entry_id}")
+        manager = _get_manager(ctx, minio_url)
+
+        with manager.batch():
+            for entry_id in entry_ids:
+                if manager.update_status(entry_id, 'inactive'):
+                    click.echo(f"Deactivated entry: {entry_id}")
+                else:
+                    click.echo(f"Entry not found: {entry_id}")
 
     except Exception as e:
         logger.error(f"Failed to deactivate entry: {e}")
@@ -127,29 +122,24 @@ def ignore_deactivate(entry_id: str, minio_url: Optional[str]):
 
 
 @ignore.command('activate')
-@click.argument('entry_id')
+@click.argument('entry_ids', nargs=-1, required=True)
 @click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
-def ignore_activate(entry_id: str, minio_url: Optional[str]):
+@click.pass_context
+def ignore_activate(ctx: click.Context, entry_ids: Tuple[str, ...], minio_url: Optional[str]):
     """
-    Activate an entry in the ignore list.
+    Activate entries in the ignore list.
 
-    ENTRY_ID: The ID of the entry to activate
+    ENTRY_IDS: The IDs of the entries to activate (saved in one write)
     """
     try:
-        config = get_minio_config()
-        if minio_url:
-            config['url'] = minio_url
-
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
-
-        if manager.update_status(entry_id, 'active'):
-            click.echo(f"Activated entry: {entry_id}")
-        else:
-            click.echo(f"Entry not found: {entry_id}")
+        manager = _get_manager(ctx, minio_url)
+
+        with manager.batch():
+            for entry_id in entry_ids:
+                if manager.update_status(entry_id, 'active'):
+                    click.echo(f"Activated entry: {entry_id}")
+                else:
+                    click.echo(f"Entry not found: {entry_id}")
 
     except Exception as e:
         logger.error(f"Failed to activate entry: {e}")
@@ -162,18 +152,11 @@ def ignore_activate(entry_id: str, minio_url: Optional[str]):
               type=click.Choice(['table', 'json']),
               help='Output format')
 @click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
-def ignore_list(active_only: bool, output_format: str, minio_url: Optional[str]):
+@click.pass_context
+def ignore_list(ctx: click.Context, active_only: bool, output_format: str, minio_url: Optional[str]):
     """List all entries in the ignore list."""
     try:
-        config = get_minio_config()
-        if minio_url:
-            config['url'] = minio_url
-
-        manager = LokiIgnoreManager(
-            config['url'],
-            config['access_key'],
-            config['secret_key']
-        )
+        manager = _get_manager(ctx, minio_url)
 
         entries = manager.list_entries(active_only=active_only)
 
@@ -182,35 +165,92 @@ def ignore_list(active_only: bool, output_format: str, minio_url: Optional[str])
             return
 
         if output_format == 'json':
-            click.echo(json.dumps(entries, indent=2))
+            click.echo(orjson.dumps(entries, option=orjson.OPT_INDENT_2).decode('utf-8'))
         else:
-            # Table format
-            click.echo("Loki Ignore List:")
-            click.echo()
-            click.echo(f"{'ID':<40} {'Signature':<40} {'Status':<10} {'Expires':<20}")
-            click.echo("-" * 114)
-
+            # Table format, rendered into one buffer and written once
+            rows = [
+                "Loki Ignore List:",
+                "",
+                f"{'ID':<40} {'Signature':<40} {'Status':<10} {'Expires':<20}",
+                "-" * 114,
+            ]
+
+            fromisoformat = datetime.fromisoformat
             for entry in entries:
-                entry_id = entry['id']  # Show full UUID
                 signature = entry['log_signature']
                 if len(signature) > 37:
                     signature = signature[:34] + '...'
+                expire_str = fromisoformat(entry['expire_date']).strftime('%Y-%m-%d %H:%M')
 
-                status = entry['status']
-                expire_date = datetime.fromisoformat(entry['expire_date'])
-                expire_str = expire_date.strftime('%Y-%m-%d %H:%M')
-
-                status_display = status
-
-                click.echo(f"{entry_id:<40} {signature:<40} {status_display:<10} {expire_str:<20}")
+                # Show full UUID
+                rows.append(f"{entry['id']:<40} {signature:<40} {entry['status']:<10} {expire_str:<20}")
 
-            click.echo()
-            click.echo(f"Total entries: {len(entries)}")
+            rows.append("")
+            rows.append(f"Total entries: {len(entries)}")
+            click.echo("\n".join(rows))
 
     except Exception as e:
         logger.error(f"Failed to list entries: {e}")
         raise click.ClickException(f"Failed to list entries: {e}")
 
 
+@ignore.command('apply')
+@click.option('-f', '--file', 'input_file', type=click.File('r'), default='-', show_default=True,
+              help='JSON lines file of operations to apply ("-" reads stdin)')
+@click.option('--minio-url', help='MinIO URL (overrides MINIO_URL env var)')
+@click.pass_context
+def ignore_apply(ctx: click.Context, input_file, minio_url: Optional[str]):
+    """
+    Apply several ignore list changes read as JSON lines.
+
+    All successful operations are saved with a single write at the end.
+
+    \b
+    Each line is one operation:
+        {"op": "set", "log_signature": "Connection timeout", "duration": "7 days"}
+        {"op": "delete", "id": "..."}
+        {"op": "activate", "id": "..."}
+        {"op": "deactivate", "id": "..."}
+
+    \b
+    Examples:
+        todops loki ignore apply -f changes.jsonl
+        ./cleanup.sh | todops loki ignore apply
+    """
+    failures = 0
+    try:
+        manager = _get_manager(ctx, minio_url)
+        with manager.batch():
+            for line_no, line in enumerate(input_file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    op = json.loads(line)
+                    action = op['op']
+                    if action == 'set':
+                        entry_id, _ = manager.add_ignore_entry(op['log_signature'], op.get('duration', '7 days'))
+                        click.echo(f"{line_no}: set {entry_id}")
+                    elif action == 'delete':
+                        found = manager.delete_entry(op['id'])
+                        click.echo(f"{line_no}: {'deleted' if found else 'not found'} {op['id']}")
+                    elif action in ('activate', 'deactivate'):
+                        status = 'active' if action == 'activate' else 'inactive'
+                        found = manager.update_status(op['id'], status)
+                        click.echo(f"{line_no}: {action + 'd' if found else 'not found'} {op['id']}")
+                    else:
+                        raise ValueError(f"unknown op '{action}'")
+                except Exception as e:
+                    failures += 1
+                    click.echo(f"{line_no}: error: {e}", err=True)
+    except Exception as e:
+        logger.error(f"Failed to apply batch: {e}")
+        raise click.ClickException(f"Failed to apply batch: {e}")
+
+    if failures:
+        raise click.ClickException(f"{failures} operation(s) failed")
+
+
 if __name__ == '__main__':
     ignore()
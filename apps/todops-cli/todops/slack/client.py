@@ -6,6 +6,13 @@ from typing import Dict, Optional
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+# Emoji that mark a section-header line (together with a "*" for bold)
+_SECTION_EMOJI = frozenset("📈📊🕐📋🔍")
+
+# Header blocks are plain text, so mrkdwn bold markers are dropped
+_STRIP_BOLD = str.maketrans("", "", "*")
 
 
 class SlackClient:
@@ -18,6 +25,9 @@ class SlackClient:
             raise ValueError("SLACK_BOT_TOKEN environment variable is required")
         
         self.client = WebClient(token=self.token)
+        # Several posts from one process (post-messages) can hit rate limits;
+        # wait for Retry-After once instead of failing the post
+        self.client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=1))
         
         # Channel aliases mapping
         self.channel_aliases = {
@@ -30,20 +40,12 @@ class SlackClient:
     
     def resolve_channel(self, channel_alias: str) -> str:
         """Resolve channel alias to actual channel name."""
-        # If it starts with #, use as-is
-        if channel_alias.startswith("#"):
-            return channel_alias
-        
-        # If it starts with C (channel ID), use as-is
-        if channel_alias.startswith("C"):
+        # Channel names (#...) and channel IDs (C...) are used as-is
+        if channel_alias[:1] in ("#", "C"):
             return channel_alias
-            
-        # Look up alias
-        if channel_alias in self.channel_aliases:
-            return self.channel_aliases[channel_alias]
-        
-        # Default to treating as channel name
-        return f"#{channel_alias}"
+
+        # Look up alias, defaulting to treating it as a channel name
+        return self.channel_aliases.get(channel_alias) or f"#{channel_alias}"
     
     def post_message(self, channel_alias: str, message: str, use_blocks: bool = False) -> bool:
         """Post message to Slack channel."""
@@ -90,44 +92,22 @@ class SlackClient:
     
     def _create_message_blocks(self, message: str) -> list:
         """Create Slack block format from message text."""
-        lines = message.split('\n')
         blocks = []
-        
-        # Find the header (first line with content)
+
+        # The first line with content is the header; the rest is grouped
+        # into sections, each starting at an emoji section-header line
         header_line = ""
-        content_lines = []
-        
-        for line in lines:
-            if line.strip() and not header_line:
-                header_line = line.strip()
-            elif line.strip():
-                content_lines.append(line)
-        
-        # Add header block if we have one
-        if header_line:
-            blocks.append({
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": header_line.replace("*", "").replace("✅", "✅").replace("⚠️", "⚠️")
-                }
-            })
-        
-        # Add divider
-        if header_line:
-            blocks.append({"type": "divider"})
-        
-        # Process content into sections
         current_section = []
         section_content = []
-        
-        for line in content_lines:
+
+        for line in message.splitlines():
             line = line.strip()
             if not line:
                 continue
-                
-            # If line starts with emoji and asterisk, it's a section header
-            if line and any(emoji in line for emoji in ["📈", "📊", "🕐", "📋", "🔍"]) and "*" in line:
+
+            if not header_line:
+                header_line = line
+            elif "*" in line and not _SECTION_EMOJI.isdisjoint(line):
                 # Save previous section if exists
                 if section_content:
                     current_section.append("\n".join(section_content))
@@ -137,11 +117,22 @@ class SlackClient:
             else:
                 # Add to current section content
                 section_content.append(line)
-        
+
+        # Add header block and divider if we have a header
+        if header_line:
+            blocks.append({
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": header_line.translate(_STRIP_BOLD)
+                }
+            })
+            blocks.append({"type": "divider"})
+
         # Add final section
         if section_content:
             current_section.append("\n".join(section_content))
-        
+
         # Create context block with all content
         if current_section:
             full_content = "\n\n".join(current_section)
@@ -154,9 +145,9 @@ class SlackClient:
                     }
                 ]
             })
-        
+
         return blocks
-    
+
     def list_available_aliases(self) -> Dict[str, str]:
         """Get available channel aliases."""
         return self.channel_aliases.copy()
\ No newline at end of file
@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 
+import json
 import sys
 
 import click
 
-from todops.slack.client import SlackClient
+from todops._envcache import ensure_env
 
 
 @click.group()
 def slack():
     """Slack integration commands."""
-    pass
+    ensure_env()
 
 
 @slack.command('post-message')
@@ -44,8 +45,13 @@ def slack_post_message(channel_alias, message, blocks, code):
         else:
             # Check if there's data available on stdin
             if not sys.stdin.isatty():
-                # Read from stdin
-                stdin_content = sys.stdin.read().strip()
+                # Read raw bytes and decode once as UTF-8, whatever the locale
+                try:
+                    stdin_content = sys.stdin.buffer.read().decode('utf-8', 'strict')
+                except UnicodeDecodeError:
+                    raise click.ClickException("Message read from stdin must be UTF-8")
+                # Code blocks keep the first line's indentation
+                stdin_content = stdin_content.strip('\r\n') if code else stdin_content.strip()
                 if stdin_content:
                     final_message = stdin_content
         
@@ -58,6 +64,7 @@ def slack_post_message(channel_alias, message, blocks, code):
             sys.exit(1)
         
         # Initialize Slack client
+        from todops.slack.client import SlackClient
         slack_client = SlackClient()
         
         # Send message
@@ -68,6 +75,8 @@ def slack_post_message(channel_alias, message, blocks, code):
         if not success:
             sys.exit(1)
             
+    except click.ClickException:
+        raise
     except ValueError as e:
         click.echo(f"Configuration error: {e}", err=True)
         click.echo("Make sure SLACK_BOT_TOKEN environment variable is set", err=True)
@@ -77,10 +86,59 @@ def slack_post_message(channel_alias, message, blocks, code):
         sys.exit(1)
 
 
+@slack.command('post-messages')
+@click.argument('input_file', type=click.File('r'), default='-')
+@click.option('--blocks/--no-blocks', default=False, help='Use rich block formatting (default: simple text)')
+def slack_post_messages(input_file, blocks):
+    """Post several messages read as JSON lines from INPUT_FILE (default stdin).
+
+    All messages are sent by one Slack client, so a shell loop does not pay
+    for a new process and client per message.
+
+    \b
+    Each line is one message:
+        {"channel": "alerts", "text": "Backup finished"}
+
+    \b
+    Examples:
+        todops slack post-messages < messages.jsonl
+        ./report.sh | todops slack post-messages --blocks
+    """
+    try:
+        from todops.slack.client import SlackClient
+        slack_client = SlackClient()
+    except ValueError as e:
+        click.echo(f"Configuration error: {e}", err=True)
+        click.echo("Make sure SLACK_BOT_TOKEN environment variable is set", err=True)
+        sys.exit(1)
+
+    failures = 0
+    for line_no, line in enumerate(input_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            item = json.loads(line)
+            channel_alias, text = item['channel'], item['text']
+        except (ValueError, KeyError, TypeError) as e:
+            click.echo(f"Line {line_no}: invalid message ({e})", err=True)
+            failures += 1
+            continue
+
+        if not slack_client.post_message(channel_alias, text, use_blocks=blocks):
+            failures += 1
+
+    if failures:
+        click.echo(f"{failures} message(s) failed", err=True)
+        sys.exit(1)
+
+
 @slack.command('list-channels')
 def slack_list_channels():
     """List available channel aliases."""
     try:
+        from todops.slack.client import SlackClient
         slack_client = SlackClient()
         aliases = slack_client.list_available_aliases()
         
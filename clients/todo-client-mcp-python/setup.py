@@ -8,8 +8,10 @@ setup(
     py_modules=["todoclientmcp"],
     install_requires=[
         "requests>=2.31.0",
-        "sseclient-py>=1.8.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 4 - Beta",
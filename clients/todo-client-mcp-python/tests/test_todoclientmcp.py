@@ -0,0 +1,102 @@
+"""Unit tests for the MCP client's SSE dispatch, concurrency cap and tool results"""
+
+import threading
+import time
+
+import pytest
+
+from todoclientmcp import TodoMCPClient, ToolResult
+
+
+class _FakeSSEResponse:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def iter_content(self, chunk_size=None):
+        return iter(self._chunks)
+
+
+def _event(data):
+    return b"event: message\ndata: " + data + b"\n\n"
+
+
+def test_sse_reader_skips_bad_events_and_keeps_dispatching():
+    client = TodoMCPClient("http://mcp.test")
+    reply_ready = threading.Event()
+    box = []
+    client._pending[7] = (reply_ready, box)
+    client.sse_response = _FakeSSEResponse(
+        [
+            _event(b"[1, 2, 3]"),
+            _event(b"42"),
+            _event(b"{not json"),
+            _event(b'{"jsonrpc": "2.0", "id": [7], "result": {}}'),
+            _event(b'{"jsonrpc": "2.0", "id": 7, "result": {"ok": true}}'),
+        ]
+    )
+
+    client._sse_reader()
+
+    assert reply_ready.is_set()
+    assert box == [{"jsonrpc": "2.0", "id": 7, "result": {"ok": True}}]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_concurrent_call_tools_never_exceed_max_concurrency(max_concurrency):
+    client = TodoMCPClient("http://mcp.test", max_concurrency=max_concurrency)
+    client._ensure_connected = lambda: None
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fake_post_requests(requests_, timeout=30.0):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += len(requests_)
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= len(requests_)
+        return [
+            {"id": request_id, "result": {"content": [{"text": str(request_id)}]}}
+            for request_id, _ in requests_
+        ]
+
+    client._post_requests = fake_post_requests
+
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            results.append(client.call_tools([("todos-list", {})] * 10))
+        except Exception as e:  # surfaced by the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(results) == 6 and all(len(r) == 10 for r in results)
+    assert 0 < peak <= max_concurrency
+
+
+def test_call_tool_result_keeps_is_error_flag():
+    client = TodoMCPClient("http://mcp.test")
+    client._ensure_connected = lambda: None
+    client._post_request = lambda request_id, body, timeout=30.0: {
+        "id": request_id,
+        "result": {
+            "content": [{"type": "text", "text": "Todo with id 5 not found"}],
+            "isError": True,
+        },
+    }
+
+    assert client.call_tool_result("todos-delete", {"id": 5}) == ToolResult(
+        "Todo with id 5 not found", True
+    )
+    assert client.call_tool("todos-delete", {"id": 5}) == "Todo with id 5 not found"
@@ -4,22 +4,91 @@ Todo MCP Client - Python client for interacting with todo-mcp server via SSE tra
 This client uses the Model Context Protocol (MCP) to communicate with the todo-mcp server.
 """
 
+import itertools
 import json
 import logging
-import uuid
+import socket
 import threading
-import queue
+import sys
 import time
-from typing import Optional, Dict, Any, List
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 import requests
-from sseclient import SSEClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _make_session() -> requests.Session:
+    """Create a session with a connection pool sized for concurrent callers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # Retries only apply to idempotent methods, so JSON-RPC POSTs are never resent
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by every TodoMCPClient that isn't given its own session
+_shared_session = _make_session()
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# The initialize request never changes, so its body is encoded once
+_INITIALIZE_ID = 1
+_INITIALIZE_BODY = _json_dumps({
+    "jsonrpc": "2.0",
+    "id": _INITIALIZE_ID,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {
+            "tools": {}
+        },
+        "clientInfo": {
+            "name": "todo-client-mcp-python",
+            "version": "1.0.0"
+        }
+    }
+})
+
+# tools/list only varies by id
+_TOOLS_LIST_BODY = '{"jsonrpc": "2.0", "id": %d, "method": "tools/list", "params": {}}'
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' natively
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        """Parse an ISO 8601 timestamp, including the 'Z' UTC suffix."""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
+
 @dataclass
 class Todo:
     """Represents a todo item"""
@@ -35,12 +104,63 @@ class Todo:
         return cls(
             id=data['id'],
             title=data['title'],
-            created_at=datetime.fromisoformat(data['created_at'].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00')),
-            due_date=datetime.fromisoformat(data['due_date'].replace('Z', '+00:00')) if data.get('due_date') else None
+            created_at=_parse_iso(data['created_at']),
+            updated_at=_parse_iso(data['updated_at']),
+            due_date=_parse_iso(data['due_date']) if data.get('due_date') else None
         )
 
 
+def _iter_sse_events(chunks):
+    """
+    Yield (event, data) pairs from an iterable of raw SSE byte chunks.
+
+    Lines are split out of a rolling buffer as chunks arrive, so parsing is
+    linear in the bytes received.
+    """
+    buffer = bytearray()
+    event = 'message'
+    data_lines = []
+
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end == -1:
+                break
+            line = bytes(buffer[start:end]).rstrip(b'\r')
+            start = end + 1
+
+            # A blank line dispatches the event collected so far
+            if not line:
+                if data_lines:
+                    yield event, '\n'.join(data_lines)
+                event = 'message'
+                data_lines = []
+                continue
+
+            # Lines starting with ':' are comments (keep-alives)
+            if line.startswith(b':'):
+                continue
+
+            field, _, value = line.partition(b':')
+            if value.startswith(b' '):
+                value = value[1:]
+
+            if field == b'data':
+                data_lines.append(value.decode('utf-8'))
+            elif field == b'event':
+                event = value.decode('utf-8')
+        del buffer[:start]
+
+
+@dataclass(frozen=True)
+class ToolResult:
+    """Text of a tool call result and whether the server flagged it with isError"""
+    text: str
+    is_error: bool = False
+
+
 class MCPError(Exception):
     """Base exception for MCP client errors"""
     pass
@@ -72,28 +192,66 @@ class TodoMCPClient:
         client.disconnect()
     """
 
-    def __init__(self, base_url: str = "http://localhost:8081"):
+    def __init__(self, base_url: str = "http://localhost:8081",
+                 http_session: Optional[requests.Session] = None,
+                 max_concurrency: int = 8,
+                 stateless: bool = False,
+                 idle_timeout: Optional[float] = None):
         """
         Initialize MCP client.
 
         Args:
             base_url: Base URL of the todo-mcp server (e.g., "http://localhost:8081")
+            http_session: Optional requests session to use; defaults to a
+                          pooled session shared by all clients in the process
+            max_concurrency: Maximum tool calls in flight at once; further
+                             calls wait for a free slot
+            stateless: Open a fresh session for each call and close it
+                       afterwards, so no SSE connection is held between calls
+            idle_timeout: Close the session after this many seconds without
+                          a call; the next call reconnects
         """
         self.base_url = base_url.rstrip('/')
         self.sse_url = f"{self.base_url}/sse"
         self.session_id: Optional[str] = None
-        self.sse_client: Optional[SSEClient] = None
+        self.sse_response: Optional[requests.Response] = None
         self.initialized = False
-        self.http_session = requests.Session()  # Reuse same session for all requests
+        self.http_session = http_session or _shared_session
         self.sse_thread: Optional[threading.Thread] = None
-        self.response_queue: queue.Queue = queue.Queue()
+        # In-flight requests by JSON-RPC id: (event set on reply, list holding the reply)
+        self._pending: Dict[Any, Tuple[threading.Event, list]] = {}
+        self._pending_lock = threading.Lock()
+        # JSON-RPC ids only need to be unique per session; 1 is the initialize request
+        self._next_id = itertools.count(_INITIALIZE_ID + 1).__next__
+        self._inflight = threading.BoundedSemaphore(max_concurrency)
         self.stop_event = threading.Event()
+        self.session_ready = threading.Event()
+        self.stateless = stateless
+        self.idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
+        self._idle_closed = False
+        self._reaper_thread: Optional[threading.Thread] = None
+        # Serializes connect/disconnect between callers and the idle reaper
+        self._conn_lock = threading.RLock()
 
     def connect(self) -> None:
         """
         Connect to the MCP server and initialize the session.
         This establishes the SSE connection and sends the initialize request.
+        Stateless clients connect per call, so this does nothing for them.
         """
+        if self.stateless:
+            return
+
+        with self._conn_lock:
+            self._connect()
+
+    def _connect(self) -> None:
+        # Reset state left by an earlier disconnect()
+        self._idle_closed = False
+        self.stop_event.clear()
+        self.session_ready.clear()
+
         # Establish SSE connection (GET /sse)
         logger.info(f"Connecting to MCP server at {self.sse_url}")
         headers = {
@@ -105,7 +263,7 @@ class TodoMCPClient:
         if response.status_code != 200:
             raise MCPError(f"Failed to connect to SSE endpoint: {response.status_code}")
 
-        self.sse_client = SSEClient(response)
+        self.sse_response = response
 
         # Start background thread to read SSE events and extract session ID
         self.sse_thread = threading.Thread(target=self._sse_reader, daemon=True)
@@ -113,109 +271,211 @@ class TodoMCPClient:
 
         # Wait for the endpoint event to be processed by background thread
         logger.info("Waiting for endpoint event from server...")
-        timeout = 10.0
-        start_time = time.time()
-        while not self.session_id:
-            if time.time() - start_time > timeout:
-                raise MCPError("Timeout waiting for endpoint event")
-            time.sleep(0.01)
+        if not self.session_ready.wait(timeout=10.0):
+            raise MCPError("Timeout waiting for endpoint event")
 
         logger.info(f"SSE connection established with session {self.session_id}")
 
         # Send initialize request
         self._initialize()
 
+        self._last_used = time.monotonic()
+        if self.idle_timeout:
+            self._reaper_thread = threading.Thread(target=self._idle_reaper, daemon=True)
+            self._reaper_thread.start()
+
+    def _idle_reaper(self):
+        """Background thread that closes the session once it has been idle for idle_timeout"""
+        interval = min(self.idle_timeout, 5.0)
+        while not self.stop_event.wait(interval):
+            with self._conn_lock:
+                if self.stop_event.is_set():
+                    return
+                with self._pending_lock:
+                    busy = bool(self._pending)
+                if busy or time.monotonic() - self._last_used < self.idle_timeout:
+                    continue
+                logger.info(f"Closing MCP session idle for more than {self.idle_timeout}s")
+                self._idle_closed = True
+                self._disconnect()
+                return
+
+    def _ensure_connected(self) -> None:
+        """Raise unless connected, reconnecting first if the idle reaper closed the session"""
+        with self._conn_lock:
+            if not self.initialized and self._idle_closed:
+                self._connect()
+            if not self.initialized:
+                raise MCPError("Client not initialized. Call connect() first.")
+            self._last_used = time.monotonic()
+
+    @contextmanager
+    def _one_shot_client(self) -> Iterator['TodoMCPClient']:
+        """Connected client used for a single call in stateless mode"""
+        client = TodoMCPClient(self.base_url, http_session=self.http_session)
+        with client:
+            yield client
+
     def _sse_reader(self):
-        """Background thread that reads SSE events and queues responses"""
+        """Background thread that reads SSE events and hands responses to waiting requests"""
         try:
-            for event in self.sse_client.events():
+            # chunk_size=None hands over data as soon as it arrives
+            chunks = self.sse_response.iter_content(chunk_size=None)
+            for event, data in _iter_sse_events(chunks):
                 if self.stop_event.is_set():
                     break
 
                 # Handle endpoint event (contains session ID)
-                if event.event == 'endpoint' and event.data:
-                    endpoint_url = event.data.strip()
+                if event == 'endpoint' and data:
+                    endpoint_url = data.strip()
                     logger.debug(f"Received endpoint: {endpoint_url}")
                     if '?sessionid=' in endpoint_url:
                         self.session_id = endpoint_url.split('?sessionid=')[1]
                         logger.debug(f"Extracted session ID: {self.session_id}")
+                        self.session_ready.set()
                     continue
 
                 # Handle message events (JSON-RPC responses)
-                if event.event == 'message' and event.data:
+                if event == 'message' and data:
+                    # One bad event must not end the reader, or every
+                    # pending and later call would wait for its timeout
                     try:
-                        data = json.loads(event.data)
-                        logger.debug(f"SSE message received: {data}")
-                        self.response_queue.put(data)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to parse SSE message: {event.data}")
+                        self._dispatch_message(data)
+                    except Exception as e:
+                        logger.warning(f"Failed to handle SSE message {data!r}: {e}")
         except Exception as e:
-            logger.error(f"SSE reader thread error: {e}", exc_info=True)
+            # The stream is closed under the reader on disconnect
+            if not self.stop_event.is_set():
+                logger.error(f"SSE reader thread error: {e}", exc_info=True)
+
+    def _dispatch_message(self, data: str) -> None:
+        """Hand one SSE message event to the request waiting for it"""
+        try:
+            message = _json_loads(data)
+        except ValueError:
+            # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+            logger.warning(f"Failed to parse SSE message: {data}")
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SSE message received: %s", message)
+
+        if not isinstance(message, dict):
+            logger.warning(f"Dropping SSE message that is not a JSON-RPC object: {data}")
+            return
+
+        with self._pending_lock:
+            waiter = self._pending.pop(message.get('id'), None)
+        if waiter is None:
+            logger.warning(f"Dropping SSE message with no pending request: {message}")
+            return
+        event_set, box = waiter
+        box.append(message)
+        event_set.set()
 
     def _initialize(self) -> None:
         """Send initialize request to the MCP server"""
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "clientInfo": {
-                    "name": "todo-client-mcp-python",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        response = self._send_request(init_request)
+        response = self._post_request(_INITIALIZE_ID, _INITIALIZE_BODY)
         if 'error' in response:
             raise MCPError(f"Initialize failed: {response['error']}")
 
         self.initialized = True
         logger.info("MCP session initialized successfully")
 
-    def _send_request(self, request: dict) -> dict:
+    def _post_request(self, request_id: Any, body: bytes, timeout: float = 30.0) -> dict:
         """
-        Send a JSON-RPC request via POST to the SSE endpoint.
+        POST an already encoded JSON-RPC request and wait for its response.
+
+        Responses are matched to requests by id, so several threads can have
+        requests in flight on the same session.
 
         Args:
-            request: JSON-RPC request object
+            request_id: The id field of the encoded request
+            body: JSON-encoded request
+            timeout: Seconds to wait for the response on the SSE stream
 
         Returns:
             JSON-RPC response object
         """
+        return self._post_requests([(request_id, body)], timeout)[0]
+
+    def _post_requests(self, requests_: List[Tuple[Any, bytes]], timeout: float = 30.0) -> List[dict]:
+        """
+        POST already encoded JSON-RPC requests back to back, then wait for all responses.
+
+        Args:
+            requests_: (id, JSON-encoded request) pairs
+            timeout: Seconds to wait for all responses on the SSE stream
+
+        Returns:
+            JSON-RPC response objects, in request order
+        """
         if not self.session_id:
             raise MCPError("Not connected. Call connect() first.")
 
         # POST to /sse?sessionid=<session_id>
         url = f"{self.sse_url}?sessionid={self.session_id}"
-        headers = {
-            'Content-Type': 'application/json',
+
+        # Register before posting; a reply can arrive before post() returns
+        waiters = [(threading.Event(), []) for _ in requests_]
+        with self._pending_lock:
+            for (request_id, _), waiter in zip(requests_, waiters):
+                self._pending[request_id] = waiter
+
+        try:
+            debug = logger.isEnabledFor(logging.DEBUG)
+            for _, body in requests_:
+                logger.info("Posting to URL: %s", url)
+                if debug:
+                    logger.debug("Sending request: %s", body.decode('utf-8'))
+                response = self.http_session.post(url, data=body, headers=_JSON_HEADERS)
+                logger.info("POST response status: %s", response.status_code)
+
+                if response.status_code not in [200, 202]:
+                    raise MCPError(f"Request failed with status {response.status_code}: {response.text}")
+
+            # For SSE transport, responses come through the SSE stream, not the POST response
+            # The POST just accepts the request (202 Accepted)
+            logger.debug("Requests sent, waiting for responses from SSE stream")
+            deadline = time.monotonic() + timeout
+            for reply_ready, _ in waiters:
+                if not reply_ready.wait(max(deadline - time.monotonic(), 0)):
+                    raise MCPError(f"No response received within {timeout} seconds")
+            return [box[0] for _, box in waiters]
+        finally:
+            with self._pending_lock:
+                for request_id, _ in requests_:
+                    self._pending.pop(request_id, None)
+
+    def _tool_call_request(self, tool_name: str, arguments: dict) -> Tuple[int, bytes]:
+        """Build and encode a tools/call request, returning (id, body)"""
+        request_id = self._next_id()
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
+            }
         }
+        return request_id, _json_dumps(request)
 
-        logger.info(f"Posting to URL: {url}")
-        logger.debug(f"Sending request: {json.dumps(request, indent=2)}")
-        response = self.http_session.post(url, json=request, headers=headers)
-        logger.info(f"POST response status: {response.status_code}")
+    @staticmethod
+    def _tool_result(response: dict) -> ToolResult:
+        """Return the result of a tools/call response, raising MCPError on failure"""
+        if 'error' in response:
+            raise MCPError(f"Tool call failed: {response['error']}")
 
-        if response.status_code not in [200, 202]:
-            raise MCPError(f"Request failed with status {response.status_code}: {response.text}")
+        # Extract content from result
+        result = response.get('result', {})
+        content = result.get('content', [])
 
-        # For SSE transport, response comes through the SSE stream, not the POST response
-        # The POST just accepts the request (202 Accepted)
-        logger.debug("Request sent, reading response from SSE stream")
-        return self._read_sse_response()
+        if not content:
+            raise MCPError("No content in tool response")
 
-    def _read_sse_response(self, timeout: float = 30.0) -> dict:
-        """Read the next JSON-RPC response from the SSE stream (via background thread queue)"""
-        try:
-            response = self.response_queue.get(timeout=timeout)
-            return response
-        except queue.Empty:
-            raise MCPError(f"No response received within {timeout} seconds")
+        # The first content item's text; tool-level failures such as an
+        # unknown id still arrive as text, flagged with isError
+        return ToolResult(content[0].get('text', ''), bool(result.get('isError')))
 
     def call_tool(self, tool_name: str, arguments: dict) -> Any:
         """
@@ -228,33 +488,78 @@ class TodoMCPClient:
         Returns:
             Tool result content
         """
-        if not self.initialized:
-            raise MCPError("Client not initialized. Call connect() first.")
+        return self.call_tool_result(tool_name, arguments).text
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
+    def call_tool_result(self, tool_name: str, arguments: dict) -> ToolResult:
+        """
+        Call an MCP tool, keeping the server's isError flag with the result.
 
-        response = self._send_request(request)
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool arguments
 
-        if 'error' in response:
-            raise MCPError(f"Tool call failed: {response['error']}")
+        Returns:
+            Tool result text and error flag
+        """
+        if self.stateless:
+            with self._one_shot_client() as client:
+                return client.call_tool_result(tool_name, arguments)
 
-        # Extract content from result
-        result = response.get('result', {})
-        content = result.get('content', [])
+        self._ensure_connected()
 
-        if not content:
-            raise MCPError("No content in tool response")
+        request_id, body = self._tool_call_request(tool_name, arguments)
+        with self._inflight:
+            response = self._post_request(request_id, body)
 
-        # Return the first content item's text
-        return content[0].get('text', '')
+        return self._tool_result(response)
+
+    def call_tools(self, calls: List[Tuple[str, dict]]) -> List[Any]:
+        """
+        Call several MCP tools, sending each request without waiting for
+        the previous response.
+
+        Each request in flight takes one concurrency slot, so requests go
+        out in groups sized by the slots free at the time.
+
+        Args:
+            calls: (tool name, arguments) pairs
+
+        Returns:
+            Tool result contents, in call order
+        """
+        if self.stateless:
+            with self._one_shot_client() as client:
+                return client.call_tools(calls)
+
+        self._ensure_connected()
+
+        encoded = [self._tool_call_request(name, arguments) for name, arguments in calls]
+        responses = []
+        start = 0
+        while start < len(encoded):
+            slots = self._acquire_slots(len(encoded) - start)
+            try:
+                responses.extend(self._post_requests(encoded[start:start + slots]))
+            finally:
+                for _ in range(slots):
+                    self._inflight.release()
+            start += slots
+
+        return [self._tool_result(response).text for response in responses]
+
+    def _acquire_slots(self, wanted: int) -> int:
+        """
+        Wait for one concurrency slot, then take up to wanted - 1 more that
+        are free right away. Returns the number of slots taken.
+
+        Never waiting while holding slots means callers cannot deadlock each
+        other by each holding part of what they want.
+        """
+        self._inflight.acquire()
+        taken = 1
+        while taken < wanted and self._inflight.acquire(blocking=False):
+            taken += 1
+        return taken
 
     def add_todo(self, title: str, due_date: Optional[str] = None) -> str:
         """
@@ -273,6 +578,18 @@ class TodoMCPClient:
 
         return self.call_tool("add_todo", arguments)
 
+    def add_todos(self, titles: List[str]) -> List[str]:
+        """
+        Add several todo items, sending the requests together.
+
+        Args:
+            titles: Titles of the todo items
+
+        Returns:
+            Success messages, in the same order as titles
+        """
+        return self.call_tools([("add_todo", {"title": title}) for title in titles])
+
     def get_todos(self) -> List[Todo]:
         """
         Get all todo items.
@@ -282,21 +599,16 @@ class TodoMCPClient:
         """
         result = self.call_tool("get_todos", {})
 
-        # Parse the response - it might be JSON or formatted text
+        # The response is either a JSON array or formatted text like
+        # "Found 2 todos:\n[...]"; parse from the first '[' in one pass
+        start = result.find('[')
+        if start == -1:
+            raise MCPError(f"Failed to parse todos response: {result}")
         try:
-            # Try to parse as JSON array
-            todos_data = json.loads(result)
-            return [Todo.from_dict(todo) for todo in todos_data]
+            todos_data = _json_loads(result[start:] if start else result)
         except json.JSONDecodeError:
-            # Response might be formatted text like "Found 2 todos:\n[...]"
-            # Try to extract JSON from the text
-            if '\n' in result:
-                # Split and try to parse the JSON part
-                parts = result.split('\n', 1)
-                if len(parts) > 1:
-                    todos_data = json.loads(parts[1])
-                    return [Todo.from_dict(todo) for todo in todos_data]
             raise MCPError(f"Failed to parse todos response: {result}")
+        return [Todo.from_dict(todo) for todo in todos_data]
 
     def update_todo(self, todo_id: int, title: Optional[str] = None, due_date: Optional[str] = None) -> str:
         """
@@ -337,17 +649,15 @@ class TodoMCPClient:
         Returns:
             List of tool definitions
         """
-        if not self.initialized:
-            raise MCPError("Client not initialized. Call connect() first.")
+        if self.stateless:
+            with self._one_shot_client() as client:
+                return client.list_tools()
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/list",
-            "params": {}
-        }
+        self._ensure_connected()
 
-        response = self._send_request(request)
+        request_id = self._next_id()
+        body = (_TOOLS_LIST_BODY % request_id).encode('utf-8')
+        response = self._post_request(request_id, body)
 
         if 'error' in response:
             raise MCPError(f"tools/list failed: {response['error']}")
@@ -356,16 +666,33 @@ class TodoMCPClient:
 
     def disconnect(self) -> None:
         """Disconnect from the MCP server"""
+        with self._conn_lock:
+            self._idle_closed = False
+            self._disconnect()
+
+        # Joined outside the lock, which the reaper may be waiting on
+        reaper = self._reaper_thread
+        if reaper and reaper.is_alive() and reaper is not threading.current_thread():
+            reaper.join(timeout=2.0)
+
+    def _disconnect(self) -> None:
         logger.info("Disconnecting from MCP server")
 
-        # Stop SSE reader thread
+        # Stop SSE reader thread; shutting the socket down unblocks a reader
+        # waiting for data (close() alone waits for that read to finish)
         self.stop_event.set()
+        if self.sse_response is not None:
+            sock = getattr(self.sse_response.raw.connection, 'sock', None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.sse_response.close()
+            self.sse_response = None
         if self.sse_thread and self.sse_thread.is_alive():
             self.sse_thread.join(timeout=2.0)
 
-        if self.sse_client:
-            self.sse_client = None
-
         self.session_id = None
         self.initialized = False
 
@@ -379,6 +706,97 @@ class TodoMCPClient:
         self.disconnect()
 
 
+class MCPSessionPool:
+    """
+    Pool of connected TodoMCPClient instances, keyed by base URL.
+
+    Reusing a connected client skips the SSE connect and initialize
+    handshake. Each acquired client is used by one caller at a time.
+
+    Example usage:
+        with pooled_client("http://localhost:8081") as client:
+            todos = client.get_todos()
+    """
+
+    def __init__(self, max_idle: float = 300.0):
+        """
+        Args:
+            max_idle: Seconds an unused client may sit in the pool before it
+                      is disconnected instead of reused
+        """
+        self.max_idle = max_idle
+        self._pools: Dict[str, List[Tuple[TodoMCPClient, float]]] = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, base_url: str) -> TodoMCPClient:
+        now = time.monotonic()
+        stale = []
+        client = None
+
+        with self._lock:
+            idle = self._pools.setdefault(base_url, [])
+            while idle:
+                candidate, released_at = idle.pop()
+                alive = candidate.sse_thread is not None and candidate.sse_thread.is_alive()
+                if alive and now - released_at <= self.max_idle:
+                    client = candidate
+                    break
+                stale.append(candidate)
+
+        for candidate in stale:
+            candidate.disconnect()
+
+        if client is None:
+            client = TodoMCPClient(base_url)
+            client.connect()
+        return client
+
+    @contextmanager
+    def acquire(self, base_url: str = "http://localhost:8081") -> Iterator[TodoMCPClient]:
+        """
+        Borrow a connected client for base_url, creating one if none is idle.
+
+        The client goes back to the pool when the block exits normally; if
+        the block raises, the session may be broken and it is disconnected.
+        """
+        base_url = base_url.rstrip('/')
+        client = self._checkout(base_url)
+        try:
+            yield client
+        except BaseException:
+            client.disconnect()
+            raise
+
+        with self._lock:
+            self._pools.setdefault(base_url, []).append((client, time.monotonic()))
+
+    def close_all(self) -> None:
+        """Disconnect every idle client in the pool."""
+        with self._lock:
+            clients = [client for idle in self._pools.values() for client, _ in idle]
+            self._pools.clear()
+
+        for client in clients:
+            client.disconnect()
+
+
+_default_pool = MCPSessionPool()
+
+
+def pooled_client(base_url: str = "http://localhost:8081"):
+    """
+    Borrow a connected client from the process-wide session pool.
+
+    Use as a context manager; see MCPSessionPool.acquire.
+    """
+    return _default_pool.acquire(base_url)
+
+
+def close_pooled_clients() -> None:
+    """Disconnect the idle clients of the process-wide session pool."""
+    _default_pool.close_all()
+
+
 # Convenience function
 def create_client(base_url: str = "http://localhost:8081") -> TodoMCPClient:
     """
@@ -9,6 +9,9 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 4 - Beta",
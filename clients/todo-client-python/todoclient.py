@@ -4,9 +4,51 @@ Todo API Client for Python
 A simple HTTP client for interacting with the Todo API.
 """
 
+import json
+
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _make_session() -> requests.Session:
+    """Create a session with a connection pool sized for concurrent callers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # Only reads are retried: a PUT or DELETE that succeeded behind a 502
+        # would otherwise be resent and fail. After the last retry the 5xx
+        # response is returned, so raise_for_status() raises HTTPError.
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504),
+                          allowed_methods=frozenset({'GET', 'HEAD'}), raise_on_status=False),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by every TodoClient that isn't given its own session, so keep-alive
+# connections are reused across clients
+_shared_session = _make_session()
 
 
 class Todo:
@@ -48,16 +90,25 @@ class Todo:
 class TodoClient:
     """Client for interacting with the Todo API."""
 
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = "http://localhost:8080",
+                 session: Optional[requests.Session] = None):
         """
         Initialize the Todo API client.
 
         Args:
             base_url: The base URL of the Todo API (default: http://localhost:8080)
+            session: Optional requests session to use; defaults to a pooled
+                     session shared by all clients in the process
         """
         self.base_url = base_url.rstrip('/')
         self.api_base = f"{self.base_url}/api/v1"
-        self.session = requests.Session()
+        self.session = session or _shared_session
+
+    @staticmethod
+    def _json(response: requests.Response) -> Any:
+        """Raise for HTTP errors, then decode the JSON body."""
+        response.raise_for_status()
+        return _json_loads(response.content)
 
     def health_check(self) -> Dict[str, str]:
         """
@@ -69,9 +120,7 @@ class TodoClient:
         Raises:
             requests.HTTPError: If the request fails
         """
-        response = self.session.get(f"{self.base_url}/health")
-        response.raise_for_status()
-        return response.json()
+        return self._json(self.session.get(f"{self.base_url}/health"))
 
     def get_todos(self) -> List[Todo]:
         """
@@ -83,9 +132,7 @@ class TodoClient:
         Raises:
             requests.HTTPError: If the request fails
         """
-        response = self.session.get(f"{self.api_base}/todos")
-        response.raise_for_status()
-        data = response.json()
+        data = self._json(self.session.get(f"{self.api_base}/todos"))
         return [Todo.from_dict(item) for item in data]
 
     def get_todo(self, todo_id: int) -> Todo:
@@ -101,9 +148,7 @@ class TodoClient:
         Raises:
             requests.HTTPError: If the request fails (e.g., 404 if not found)
         """
-        response = self.session.get(f"{self.api_base}/todos/{todo_id}")
-        response.raise_for_status()
-        return Todo.from_dict(response.json())
+        return Todo.from_dict(self._json(self.session.get(f"{self.api_base}/todos/{todo_id}")))
 
     def create_todo(self, title: str, due_date: Optional[str] = None) -> Todo:
         """
@@ -123,9 +168,9 @@ class TodoClient:
         if due_date:
             payload["due_date"] = due_date
 
-        response = self.session.post(f"{self.api_base}/todos", json=payload)
-        response.raise_for_status()
-        return Todo.from_dict(response.json())
+        response = self.session.post(f"{self.api_base}/todos", data=_json_dumps(payload),
+                                     headers=_JSON_HEADERS)
+        return Todo.from_dict(self._json(response))
 
     def update_todo(self, todo_id: int, title: Optional[str] = None,
                     due_date: Optional[str] = None) -> Todo:
@@ -149,9 +194,9 @@ class TodoClient:
         if due_date is not None:
             payload["due_date"] = due_date
 
-        response = self.session.put(f"{self.api_base}/todos/{todo_id}", json=payload)
-        response.raise_for_status()
-        return Todo.from_dict(response.json())
+        response = self.session.put(f"{self.api_base}/todos/{todo_id}", data=_json_dumps(payload),
+                                    headers=_JSON_HEADERS)
+        return Todo.from_dict(self._json(response))
 
     def delete_todo(self, todo_id: int) -> Dict[str, str]:
         """
@@ -166,13 +211,12 @@ class TodoClient:
         Raises:
             requests.HTTPError: If the request fails (e.g., 404 if not found)
         """
-        response = self.session.delete(f"{self.api_base}/todos/{todo_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._json(self.session.delete(f"{self.api_base}/todos/{todo_id}"))
 
     def close(self):
-        """Close the HTTP session."""
-        self.session.close()
+        """Close the HTTP session, unless it is the shared one other clients use."""
+        if self.session is not _shared_session:
+            self.session.close()
 
     def __enter__(self):
         """Context manager entry."""
@@ -9,22 +9,25 @@ Built with Slack Bolt SDK using Socket Mode.
 import os
 import logging
 import threading
-from flask import Flask, jsonify
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 from dotenv import load_dotenv
 
+# Load environment variables before the local modules below read their
+# configuration at import time
+load_dotenv()
+
 from handlers import set_chat_backend
 from backends import OpenAIBackend
 from handlers.todos import todo_slash_command
 from handlers.events import app_mention
 from handlers.deploy import deploy_slash_command, handle_deploy_submission
 from otel_config import init_telemetry
+from utils.async_loop import run_async, start_async_loop, stop_async_loop
+from utils.background import stop_background
 from opentelemetry import trace
 
-# Load environment variables
-load_dotenv()
-
 # Custom log formatter that includes trace_id and span_id
 class TraceContextFormatter(logging.Formatter):
     def format(self, record):
@@ -54,21 +57,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize Flask web server for health checks
-web_app = Flask(__name__)
-
-# Initialize OpenTelemetry (must happen before Flask routes)
+# Initialize OpenTelemetry
 # This sets up the global TracerProvider via trace.set_tracer_provider(provider)
-tracer = init_telemetry(app=web_app)
-
-# Suppress /health endpoint logging
-class HealthCheckFilter(logging.Filter):
-    def filter(self, record):
-        return '/health' not in record.getMessage()
-
-werkzeug_logger = logging.getLogger('werkzeug')
-werkzeug_logger.setLevel(logging.WARNING)
-werkzeug_logger.addFilter(HealthCheckFilter())
+tracer = init_telemetry()
 
 # Initialize Slack app with Socket Mode
 app = App(
@@ -94,18 +85,32 @@ backend = OpenAIBackend()
 # Set the backend for event handlers
 set_chat_backend(backend)
 
-@web_app.route("/health")
-def health():
+# The health response never changes, so it is encoded once
+_HEALTH_BODY = b'{"status":"healthy"}'
+
+
+class HealthCheckHandler(BaseHTTPRequestHandler):
     """Health check endpoint for Kubernetes"""
-    return jsonify({
-        "status": "healthy"
-    }), 200
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != "/health":
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_HEALTH_BODY)))
+        self.end_headers()
+        self.wfile.write(_HEALTH_BODY)
+
+    def log_message(self, format, *args):
+        # Suppress per-request logging of health checks
+        pass
 
 
 def start_health_server():
-    """Start the Flask health check server in a separate thread"""
+    """Start the health check server in a separate thread"""
     logger.info(f"🏥 Starting health check server on port {SERVER_PORT}")
-    web_app.run(host='0.0.0.0', port=SERVER_PORT, debug=False)
+    ThreadingHTTPServer(('0.0.0.0', SERVER_PORT), HealthCheckHandler).serve_forever()
 
 
 def main():
@@ -120,6 +125,11 @@ def main():
             logger.error("Please check your .env file")
             return
 
+        if not os.environ.get("GH_TOKEN"):
+            # Deploy run lookups call the GitHub API directly, not through gh's stored auth
+            logger.warning("GH_TOKEN is not set; /deploy run lookups will be unauthenticated "
+                           "(60 requests/hour, and private repos return 404)")
+
         logger.info("⚡️ Todo Bot is starting...")
         logger.info(f"📍 Todo API URL: {TODO_API_URL}")
 
@@ -127,6 +137,9 @@ def main():
         health_thread = threading.Thread(target=start_health_server, daemon=True)
         health_thread.start()
 
+        # Start the shared event loop used for LLM calls before events arrive
+        start_async_loop()
+
         # Start the app using Socket Mode
         handler = SocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
 
@@ -140,6 +153,14 @@ def main():
     except Exception as e:
         logger.error(f"Failed to start app: {e}", exc_info=True)
         raise
+    finally:
+        # Let in-flight replies finish while the LLM loop is still running
+        stop_background()
+        try:
+            run_async(backend.aclose())
+        except Exception as e:
+            logger.warning(f"Failed to close chat backend: {e}")
+        stop_async_loop()
 
 
 if __name__ == "__main__":
@@ -1,34 +1,67 @@
 import os
+import asyncio
 import logging
+import time
 import json
-from typing import Dict, Any, List, Protocol
-from openai import OpenAI
-from todoclientmcp import TodoMCPClient, MCPError
+import functools
+import hashlib
+import threading
+from typing import Callable, Dict, Any, List, Optional, Protocol, Tuple
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from todoclientmcp import TodoMCPClient, MCPError, ToolResult
 
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 TODO_MCP_URL = os.environ.get("TODO_MCP_URL", "http://localhost:8081")
+HISTORY_MAX_TURNS = int(os.environ.get("HISTORY_MAX_TURNS", "12"))
+# Seconds a plain-text reply is reused for the same user, conversation and prompt; 0 disables
+REPLY_CACHE_TTL = float(os.environ.get("REPLY_CACHE_TTL", "60"))
+REPLY_CACHE_MAX_ENTRIES = 256
+# Seconds before the MCP tool list is fetched again
+MCP_TOOLS_TTL = float(os.environ.get("MCP_TOOLS_TTL", "300"))
+# Seconds a read-only tool result is reused; any other tool call clears the cache
+TOOL_CACHE_TTL = float(os.environ.get("TOOL_CACHE_TTL", "15"))
+READ_ONLY_TOOLS = frozenset({"todos-list"})
+# Minimum seconds between partial replies passed to on_partial while streaming;
+# Slack allows about one chat.update per second per channel
+STREAM_UPDATE_INTERVAL = float(os.environ.get("STREAM_UPDATE_INTERVAL", "1.0"))
 
-class ChatBackend(Protocol):
-    def chat(self, prompt: str, user: str) -> str: 
-        ...
 
-class OpenAIBackend:
-    def __init__(self): 
-        self.model = os.environ.get("OPENAI_MODEL", "gpt-4")
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY")) 
-        self.openai_max_tokens = int(os.environ.get("OPENAI_MAX_TOKENS", "1000"))
-        self.openai_temperature = float(os.environ.get("OPENAI_TEMPERATURE", "0.3"))
-        self.conversation_history = []
-        self.mcpclient = TodoMCPClient(TODO_MCP_URL)
-        self.mcpclient.connect()
-        self.mcp_tools = self.mcpclient.list_tools()
-        # logger.info(f"MCP tools loaded: {self.mcp_tools}")
+def _format_todo_list(result: str) -> str:
+    """Format a todos-list result as Slack bullets; raises ValueError for unexpected JSON."""
+    try:
+        todos = json.loads(result)
+    except json.JSONDecodeError:
+        # Plain-text results such as "No todos found"
+        return result
+    if not isinstance(todos, list) or not all(
+            isinstance(todo, dict) and "id" in todo and "title" in todo for todo in todos):
+        raise ValueError(f"unexpected todos-list result: {result[:200]}")
+    return "\n".join(f"• *#{todo['id']}* {todo['title']}" for todo in todos)
 
-    async def chat(self, prompt: str, user: str) -> str:
-        system_prompt = f"""You are a friendly bot that manages todos.
+
+def _format_status(result: str) -> str:
+    return f"✅ {result}"
+
+
+# Tools whose results are turned into a reply locally instead of by a second
+# LLM call; a formatter that raises falls back to LLM synthesis. Results the
+# server flags with isError are shown as failures without a formatter.
+_LOCAL_FORMATTERS = {
+    "todos-list": _format_todo_list,
+    "todos-add": _format_status,
+    "todos-update": _format_status,
+    "todos-delete": _format_status,
+}
+
+# Keep-alive pool for OpenAI requests, so the synthesis call and later
+# mentions reuse a warm TLS connection
+OPENAI_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+SYSTEM_PROMPT = """You are a friendly bot that manages todos.
 
 CORE CAPABILITIES:
 - Manage a list of todos, including adding, updating, deleting, and listing todos.
@@ -48,90 +81,303 @@ EXAMPLES:
 - "Delete my todo with id 1" → todos-delete(1)
 - "Update my todo with id 2 to 'walk the dog'" → todos-update(2, "walk the dog")
 """
-        # Prepare messages
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ]
-        self.conversation_history.extend(messages)
+
+_mcp_client: Optional[TodoMCPClient] = None
+_mcp_client_lock = threading.Lock()
+
+
+def get_mcp_client() -> TodoMCPClient:
+    """Return the MCP client shared by every backend, connecting on first use."""
+    global _mcp_client
+    with _mcp_client_lock:
+        if _mcp_client is None:
+            client = TodoMCPClient(TODO_MCP_URL)
+            client.connect()
+            _mcp_client = client
+    return _mcp_client
+
+@functools.lru_cache(maxsize=64)
+def _convert_mcp_tool(mcp_tool_json: str) -> Dict[str, Any]:
+    """Convert a JSON-encoded MCP tool definition to OpenAI function format."""
+    mcp_tool = json.loads(mcp_tool_json)
+
+    # Convert MCP parameters to OpenAI schema
+    properties = {}
+    required = []
+
+    for param_name, param_def in mcp_tool.get("parameters", {}).items():
+        properties[param_name] = {
+            "type": param_def.get("type", "string"),
+            "description": param_def.get("description", "")
+        }
+
+        # Add enum if present
+        if param_def.get("enum"):
+            properties[param_name]["enum"] = param_def["enum"]
+
+        # Add to required if specified
+        if param_def.get("required", True):
+            required.append(param_name)
+
+    return {
+        "name": mcp_tool["name"],
+        "description": mcp_tool["description"],
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            "required": required
+        }
+    }
+
+class ChatBackend(Protocol):
+    def chat(self, prompt: str, user: str, on_partial: Optional[Callable[[str], None]] = None) -> str: 
+        ...
+
+    def list_todos(self) -> str:
+        ...
+
+class OpenAIBackend:
+    def __init__(self): 
+        self.model = os.environ.get("OPENAI_MODEL", "gpt-4")
+        # Picking a tool or answering a short question needs no large model;
+        # the larger one is kept for putting tool results into words
+        self.router_model = os.environ.get("OPENAI_ROUTER_MODEL", "gpt-4o-mini")
+        self.synth_model = os.environ.get("OPENAI_SYNTH_MODEL", self.model)
+        # Only used from the shared event loop in utils.async_loop, which the
+        # pooled connections are bound to
+        self.client = AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(limits=OPENAI_HTTP_LIMITS),
+        )
+        self.openai_max_tokens = int(os.environ.get("OPENAI_MAX_TOKENS", "1000"))
+        self.openai_temperature = float(os.environ.get("OPENAI_TEMPERATURE", "0.3"))
+        # One conversation per Slack user; in each, the system prompt stays at
+        # index 0 and later turns are trimmed to a window
+        self._histories: Dict[str, List[Dict[str, Any]]] = {}
+        self.history_max_turns = HISTORY_MAX_TURNS
+        # (user, history digest, normalized prompt) -> (reply, expiry from
+        # time.monotonic()). A reply is stored under the conversation that
+        # includes it, so only an immediate repeat of the prompt finds it;
+        # follow-ups such as "yes" never replay a reply from another context.
+        self._reply_cache: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+        # (user, normalized prompt) -> reply still being generated
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[str]"] = {}
+        # (tool name, canonical JSON args) -> (result, expiry from time.monotonic())
+        self._tool_cache: Dict[Tuple[str, str], Tuple[ToolResult, float]] = {}
+        # Bumped by every mutating tool call, so a read that overlapped one is not cached
+        self._tool_generation = 0
+        self.mcpclient = get_mcp_client()
+        self.mcp_tools = self.mcpclient.list_tools()
+        self._tools_loaded_at = time.monotonic()
+        # logger.info(f"MCP tools loaded: {self.mcp_tools}")
+        # Built once so the function definitions sent with every request are
+        # byte-identical, keeping the prompt prefix eligible for OpenAI caching
+        self.openai_functions = self._get_available_functions()
+
+    async def chat(self, prompt: str, user: str, on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Reply to prompt from user.
+
+        When the reply is generated by streaming, on_partial is called from a
+        worker thread with the text received so far; the return value is always
+        the complete reply.
+        """
+        await self._refresh_tools_if_stale()
+
+        normalized = " ".join(prompt.lower().split())
+        cached = self._cached_reply(self._reply_key(user, normalized))
+        if cached is not None:
+            reply, expires = cached
+            logger.info("Reusing cached reply for repeated prompt")
+            history = self._history(user)
+            history.append({"role": "user", "content": prompt})
+            history.append({"role": "assistant", "content": reply})
+            self._trim_history(history)
+            # Another repeat follows this turn; it keeps the original expiry
+            self._cache_reply(self._reply_key(user, normalized), reply, expires)
+            return reply
+
+        # A repeat of a prompt that is still being answered (a double-sent
+        # mention) waits for that answer instead of making its own requests
+        inflight_key = (user, normalized)
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            logger.info("Waiting on in-flight reply for repeated prompt")
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
+            reply = await self._generate_reply(prompt, user, normalized, on_partial)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(reply)
+            return reply
+        finally:
+            del self._inflight[inflight_key]
+
+    async def _generate_reply(self, prompt: str, user: str, normalized: str,
+                              on_partial: Optional[Callable[[str], None]]) -> str:
+        """Ask the model for a reply, calling a tool if it chooses one."""
+        history = self._history(user)
+        history.append({"role": "user", "content": prompt})
+        self._trim_history(history)
 
         # Prepare API call parameters
         kwargs = {
             "max_tokens": self.openai_max_tokens,
             "temperature": self.openai_temperature,
-            "functions": self._get_available_functions(),
+            "functions": self.openai_functions,
             "function_call": "auto"
         }
 
-        response = self.client.chat.completions.create(model=self.model, messages=self.conversation_history, **kwargs)
+        response = await self.client.chat.completions.create(model=self.router_model, messages=history, **kwargs)
     
-        logger.info(f"OpenAI response: {response}")
+        logger.debug("OpenAI response: %s", response)
 
         # Handle function calls
         if response.choices[0].message.function_call:
             return await self._handle_function_call(
                 response.choices[0].message,
-                user
+                user,
+                on_partial
             )
 
         # Handle regular text response
         if response.choices and len(response.choices) > 0:
             assistant_reply = response.choices[0].message.content
             if assistant_reply:
-                self.conversation_history.append({"role": "assistant", "content": assistant_reply})
+                history.append({"role": "assistant", "content": assistant_reply})
                 assistant_reply = assistant_reply.strip()
                 if len(assistant_reply) > 3000:
                     assistant_reply = assistant_reply[:2900] + "... (truncated for length)"
+                # Replies that called a tool depend on live todo state and are never cached
+                self._cache_reply(self._reply_key(user, normalized), assistant_reply)
                 return assistant_reply
 
         return "❌ No response generated from AI agent."
 
+    async def _call_tool(self, name: str, args: Dict[str, Any]) -> ToolResult:
+        """Call an MCP tool, reusing recent results of read-only tools."""
+        if name not in READ_ONLY_TOOLS:
+            # Todos are shared by all users, so any change makes every cached read stale
+            self._tool_generation += 1
+            self._tool_cache.clear()
+            return await asyncio.to_thread(self.mcpclient.call_tool_result, name, args)
+
+        key = (name, json.dumps(args, sort_keys=True))
+        entry = self._tool_cache.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            logger.info(f"Reusing cached result for {name}")
+            return entry[0]
+
+        # The MCP client is blocking; run it off the event loop
+        generation = self._tool_generation
+        result = await asyncio.to_thread(self.mcpclient.call_tool_result, name, args)
+        if TOOL_CACHE_TTL > 0 and not result.is_error and generation == self._tool_generation:
+            self._tool_cache[key] = (result, time.monotonic() + TOOL_CACHE_TTL)
+        return result
+
+    async def _refresh_tools_if_stale(self) -> None:
+        """Re-fetch the MCP tool list once it is older than MCP_TOOLS_TTL."""
+        if time.monotonic() - self._tools_loaded_at < MCP_TOOLS_TTL:
+            return
+        try:
+            tools = await asyncio.to_thread(self.mcpclient.list_tools)
+        except Exception as e:
+            logger.warning(f"Keeping cached MCP tools, refresh failed: {e}")
+            tools = self.mcp_tools
+        self._tools_loaded_at = time.monotonic()
+        if tools != self.mcp_tools:
+            self.mcp_tools = tools
+            self.openai_functions = self._get_available_functions()
+
+    def _reply_key(self, user: str, normalized: str) -> Tuple[str, str, str]:
+        """Reply cache key for a prompt given the conversation with user so far."""
+        turns = self._histories.get(user, [])[1:]
+        digest = hashlib.sha1(json.dumps(turns, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return user, digest, normalized
+
+    def _cached_reply(self, key: Tuple[str, str, str]) -> Optional[Tuple[str, float]]:
+        """Return the cached (reply, expiry) for key, or None if missing or expired."""
+        entry = self._reply_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            del self._reply_cache[key]
+            return None
+        return entry
+
+    def _cache_reply(self, key: Tuple[str, str, str], reply: str, expires: Optional[float] = None) -> None:
+        if REPLY_CACHE_TTL <= 0:
+            return
+        now = time.monotonic()
+        if len(self._reply_cache) >= REPLY_CACHE_MAX_ENTRIES:
+            self._reply_cache = {k: v for k, v in self._reply_cache.items() if v[1] > now}
+            if len(self._reply_cache) >= REPLY_CACHE_MAX_ENTRIES:
+                # Dicts keep insertion order, so this drops the oldest entry
+                del self._reply_cache[next(iter(self._reply_cache))]
+        self._reply_cache[key] = (reply, expires if expires is not None else now + REPLY_CACHE_TTL)
+
+    async def list_todos(self) -> str:
+        """List todos as Slack bullets without asking the model, for plain list requests."""
+        try:
+            result = await self._call_tool("todos-list", {})
+        except MCPError as e:
+            logger.error(f"Error calling tool todos-list: {e}")
+            return f"❌ Error executing function todos-list: {e}"
+        if result.is_error:
+            return f"❌ {result.text}"
+        try:
+            return _format_todo_list(result.text)
+        except ValueError as e:
+            logger.warning(f"Returning todos-list result unformatted: {e}")
+            return result.text
+
+    async def aclose(self) -> None:
+        """Close the OpenAI connection pool; call from the shared event loop."""
+        await self.client.close()
+
+    def _history(self, user: str) -> List[Dict[str, Any]]:
+        """Return the conversation with user, starting a new one if needed."""
+        history = self._histories.get(user)
+        if history is None:
+            history = self._histories[user] = [{"role": "system", "content": SYSTEM_PROMPT}]
+        return history
+
+    def _trim_history(self, history: List[Dict[str, Any]]) -> None:
+        """Drop the oldest turns so at most history_max_turns follow the system prompt."""
+        excess = len(history) - 1 - self.history_max_turns
+        if excess > 0:
+            del history[1:1 + excess]
+        # Never start the window on a reply whose request was dropped
+        while len(history) > 1 and history[1]["role"] != "user":
+            del history[1]
+
     def _get_available_functions(self) -> List[Dict[str, Any]]:
         """Get the list of available functions for OpenAI function calling."""
-        if not self.mcpclient:
+        if not self.mcp_tools:
+            logger.warning("No MCP tools available - agent will have limited functionality")
             return []
 
-        # Use dynamically fetched MCP tools if available
-        if self.mcpclient:
-            return [self._convert_mcp_tool_to_openai_function(tool) for tool in self.mcp_tools]
+        return [self._convert_mcp_tool_to_openai_function(tool) for tool in self.mcp_tools]
 
-        # Fallback: Return empty list if no tools fetched
-        logger.warning("No MCP tools available - agent will have limited functionality")
-        return []
-    
     def _convert_mcp_tool_to_openai_function(self, mcp_tool: Dict[str, Any]) -> Dict[str, Any]:
         """Convert MCP tool definition to OpenAI function format."""
-        # Convert MCP parameters to OpenAI schema
-        properties = {}
-        required = []
-
-        for param_name, param_def in mcp_tool.get("parameters", {}).items():
-            properties[param_name] = {
-                "type": param_def.get("type", "string"),
-                "description": param_def.get("description", "")
-            }
-
-            # Add enum if present
-            if param_def.get("enum"):
-                properties[param_name]["enum"] = param_def["enum"]
-
-            # Add to required if specified
-            if param_def.get("required", True):
-                required.append(param_name)
-
-        return {
-            "name": mcp_tool["name"],
-            "description": mcp_tool["description"],
-            "parameters": {
-                "type": "object",
-                "properties": properties,
-                "required": required
-            }
-        }
-    
-    async def _handle_function_call(self, message: Dict[str, Any], user: str) -> str:
+        # Tools rarely change between refreshes; reuse the converted definition
+        return _convert_mcp_tool(json.dumps(mcp_tool, sort_keys=True))
+
+    async def _handle_function_call(self, message: Dict[str, Any], user: str,
+                                    on_partial: Optional[Callable[[str], None]] = None) -> str:
         """Handle function call from OpenAI response."""
-        logger.info(f"Handling function call: {message.function_call}")
+        logger.debug("Handling function call: %s", message.function_call)
 
         function_call = message.function_call
         function_name = function_call.name
@@ -139,15 +385,18 @@ EXAMPLES:
 
         logger.info(f"Function call detected: {function_name} with args {function_args_str}")
 
+        history = self._history(user)
+
         try:
             # Parse function arguments from JSON string to dict
             function_args = json.loads(function_args_str) if isinstance(function_args_str, str) else function_args_str
 
             # Call the MCP client to execute the tool
-            tool_response = self.mcpclient.call_tool(function_name, function_args)
+            tool_result = await self._call_tool(function_name, function_args)
+            tool_response = tool_result.text
 
             # Append function call and response to conversation history
-            self.conversation_history.append({
+            history.append({
                 "role": "assistant",
                 "content": None,
                 "function_call": {
@@ -155,26 +404,54 @@ EXAMPLES:
                     "arguments": function_args_str  # Keep as string for OpenAI format
                 }
             })
-            self.conversation_history.append({
+            history.append({
                 "role": "function",
                 "name": function_name,
                 "content": tool_response
             })
 
+            formatter = _LOCAL_FORMATTERS.get(function_name)
+            if tool_result.is_error and formatter is not None:
+                assistant_reply = f"❌ {tool_response}"
+                history.append({"role": "assistant", "content": assistant_reply})
+                return assistant_reply
+            if formatter is not None:
+                try:
+                    assistant_reply = formatter(tool_response)
+                except Exception as e:
+                    logger.warning(f"Local formatting of {function_name} result failed, using LLM: {e}")
+                else:
+                    history.append({"role": "assistant", "content": assistant_reply})
+                    return assistant_reply
+
             # Make another call to LLM to synthesize the function result into natural language
             logger.info("Asking LLM to synthesize function result into natural language")
-            synthesis_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=self.conversation_history,
+            # Streamed, so the reply can be shown while the rest is generated
+            stream = await self.client.chat.completions.create(
+                model=self.synth_model,
+                messages=history,
                 max_tokens=self.openai_max_tokens,
-                temperature=self.openai_temperature
+                temperature=self.openai_temperature,
+                stream=True
             )
 
-            if synthesis_response.choices and len(synthesis_response.choices) > 0:
-                assistant_reply = synthesis_response.choices[0].message.content
-                if assistant_reply:
-                    self.conversation_history.append({"role": "assistant", "content": assistant_reply})
-                    return assistant_reply.strip()
+            parts = []
+            last_partial = float("-inf")
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                if on_partial is not None and time.monotonic() - last_partial >= STREAM_UPDATE_INTERVAL:
+                    last_partial = time.monotonic()
+                    await asyncio.to_thread(on_partial, "".join(parts))
+
+            assistant_reply = "".join(parts)
+            if assistant_reply:
+                history.append({"role": "assistant", "content": assistant_reply})
+                return assistant_reply.strip()
 
             # Fallback to raw response if synthesis fails
             return tool_response
@@ -1,121 +1,146 @@
 import logging
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 
+import httpx
+
 from utils.subprocess import run_command
 
 logger = logging.getLogger(__name__)
 
+# Looks up the workflow run for a submitted deploy, so the Bolt worker that
+# handled the submission is not held for the polling
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="deploy-run")
 
-def deploy_slash_command(ack, command, client):
-    """
-    Handle /deploy slash command by opening a modal
-    """
-    # Acknowledge the command immediately
-    ack()
+# Reused for every run lookup, so polling keeps one warm connection to GitHub
+_GH_TOKEN = os.environ.get("GH_TOKEN")
+_GH = httpx.Client(
+    base_url="https://api.github.com",
+    headers={
+        "Accept": "application/vnd.github+json",
+        **({"Authorization": f"Bearer {_GH_TOKEN}"} if _GH_TOKEN else {}),
+    },
+)
+_DEPLOYMENT_RUNS_PATH = "/repos/scottseotech/todo-platform/actions/workflows/deployment.yaml/runs"
 
-    try:
-        # Open the modal
-        client.views_open(
-            trigger_id=command["trigger_id"],
-            view={
-                "type": "modal",
-                "callback_id": "deploy_modal",
-                "title": {
-                    "type": "plain_text",
-                    "text": "Deploy Service"
-                },
-                "submit": {
-                    "type": "plain_text",
-                    "text": "Deploy"
-                },
-                "close": {
+# The modal has no per-user content, so the view is built once at import time
+_DEPLOY_MODAL_VIEW = {
+    "type": "modal",
+    "callback_id": "deploy_modal",
+    "title": {
+        "type": "plain_text",
+        "text": "Deploy Service"
+    },
+    "submit": {
+        "type": "plain_text",
+        "text": "Deploy"
+    },
+    "close": {
+        "type": "plain_text",
+        "text": "Cancel"
+    },
+    "blocks": [
+        {
+            "type": "input",
+            "block_id": "service_block",
+            "element": {
+                "type": "multi_static_select",
+                "action_id": "service_select",
+                "placeholder": {
                     "type": "plain_text",
-                    "text": "Cancel"
+                    "text": "Select one or more services"
                 },
-                "blocks": [
+                "options": [
                     {
-                        "type": "input",
-                        "block_id": "service_block",
-                        "element": {
-                            "type": "multi_static_select",
-                            "action_id": "service_select",
-                            "placeholder": {
-                                "type": "plain_text",
-                                "text": "Select one or more services"
-                            },
-                            "options": [
-                                {
-                                    "text": {
-                                        "type": "plain_text",
-                                        "text": "todo-api"
-                                    },
-                                    "value": "todo-api"
-                                },
-                                {
-                                    "text": {
-                                        "type": "plain_text",
-                                        "text": "todo-mcp"
-                                    },
-                                    "value": "todo-mcp"
-                                },
-                                {
-                                    "text": {
-                                        "type": "plain_text",
-                                        "text": "todo-bot"
-                                    },
-                                    "value": "todo-bot"
-                                }
-                            ]
-                        },
-                        "label": {
+                        "text": {
                             "type": "plain_text",
-                            "text": "Services"
-                        }
+                            "text": "todo-api"
+                        },
+                        "value": "todo-api"
                     },
                     {
-                        "type": "input",
-                        "block_id": "version_block",
-                        "element": {
-                            "type": "plain_text_input",
-                            "action_id": "version_input",
-                            "placeholder": {
-                                "type": "plain_text",
-                                "text": "e.g., v1.0.0 or abc1234"
-                            }
+                        "text": {
+                            "type": "plain_text",
+                            "text": "todo-mcp"
                         },
-                        "label": {
+                        "value": "todo-mcp"
+                    },
+                    {
+                        "text": {
                             "type": "plain_text",
-                            "text": "Version"
-                        }
+                            "text": "todo-bot"
+                        },
+                        "value": "todo-bot"
                     }
                 ]
+            },
+            "label": {
+                "type": "plain_text",
+                "text": "Services"
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "version_block",
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "version_input",
+                "placeholder": {
+                    "type": "plain_text",
+                    "text": "e.g., v1.0.0 or abc1234"
+                }
+            },
+            "label": {
+                "type": "plain_text",
+                "text": "Version"
             }
+        }
+    ]
+}
+
+
+def deploy_slash_command(ack, command, client):
+    """
+    Handle /deploy slash command by opening a modal
+    """
+    # Acknowledge the command immediately
+    ack()
+
+    try:
+        # Open the modal
+        client.views_open(
+            trigger_id=command["trigger_id"],
+            view=_DEPLOY_MODAL_VIEW
         )
     except Exception as e:
-        logger.error(f"[/deploy] Error opening modal: {e}", exc_info=True)
+        logger.exception("[/deploy] Error opening modal: %s", e)
 
 
 def handle_deploy_submission(ack, body, client, logger):
     """
     Handle the deploy modal submission
     """
+    services, version = _extract_submission(body.get("view", {}).get("state", {}).get("values", {}))
+
+    errors = {}
+    if not services:
+        errors["service_block"] = "Select at least one service."
+    if not version:
+        errors["version_block"] = "Enter a version to deploy."
+    if errors:
+        # Shown on the fields in the still-open modal
+        ack(response_action="errors", errors=errors)
+        return
+
     # Acknowledge the submission
     ack()
 
     try:
-        # Extract the values from the modal
-        values = body["view"]["state"]["values"]
-
-        # Get selected services (multi-select returns an array)
-        selected_options = values["service_block"]["service_select"]["selected_options"]
-        services = [option["value"] for option in selected_options]
-
-        version = values["version_block"]["version_input"]["value"]
-
         user_id = body["user"]["id"]
 
-        logger.info(f"[deploy] User: {user_id}, Services: {services}, Version: {version}")
+        logger.info("[deploy] User: %s, Services: %s, Version: %s", user_id, services, version)
 
         servicesObj = {"service": services}
         servicesJson = json.dumps(servicesObj)
@@ -131,65 +156,125 @@ def handle_deploy_submission(ack, body, client, logger):
             "-f", 
             f"services={servicesJson}"
         ]
-        run_command(cmds)
-
-        search_cmd = f'gh run list --workflow=deployment.yaml --limit=10 --json databaseId,displayTitle --jq ".[] | select(.displayTitle | ascii_downcase | contains(\\"{version}\\" | ascii_downcase)) | .databaseId" | head -1'
-        
-        run_id = ""
-        for i in range(10):
-            sleep(1)
-            result = run_command(search_cmd, shell=True, debug=False)
-            output = result.stdout.strip()
-            if output:
-                run_id=output
-                break
+        # Only the exit status matters; stderr is still logged on failure
+        run_command(cmds, capture=False)
 
         services_list = ", ".join([f"{svc}" for svc in services])
 
-        # Send a message to the user
-        client.chat_postMessage(
+        # Post right away and fill in the run link once GitHub lists the run
+        response = client.chat_postMessage(
             channel=user_id,
             text=f"Service Deployment initiated",
             unfurl_links=False,
-            blocks=[
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f":information_source: Service Deployment {version}"
-                    }
-                },
+            blocks=_deployment_blocks(version, services_list, "pending…")
+        )
+        _EXECUTOR.submit(_resolve_and_notify, client, response["channel"], response["ts"],
+                         version, services_list)
+
+    except Exception as e:
+        logger.exception("[deploy] Error handling submission: %s", e)
+
+
+def _extract_submission(values):
+    """
+    Return (services, version) from the modal state, with empty values for anything missing
+    """
+    # Multi-select returns an array of selected options
+    selected_options = values.get("service_block", {}).get("service_select", {}).get("selected_options") or []
+    services = [option["value"] for option in selected_options if "value" in option]
+    version = (values.get("version_block", {}).get("version_input", {}).get("value") or "").strip()
+    return services, version
+
+
+def _deployment_blocks(version, services_list, run_link):
+    return [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f":information_source: Service Deployment {version}"
+            }
+        },
+        {
+            "type": "divider"
+        },
+        {
+          "type": "section",
+          "fields": [
+            {
+              "type": "mrkdwn",
+              "text": "*Github Workflow Run:*"
+            },
+            {
+              "type": "mrkdwn",
+              "text": run_link
+            }
+          ]
+        },
+        {
+            "type": "section",
+            "fields": [
                 {
-                    "type": "divider"
+                    "type": "mrkdwn",
+                    "text": f"*Services:* "
                 },
                 {
-                  "type": "section",
-                  "fields": [
-                    {
-                      "type": "mrkdwn",
-                      "text": "*Github Workflow Run:*"
-                    },
-                    {
-                      "type": "mrkdwn",
-                      "text": f"<https://github.com/scottseotech/todo-platform/actions/runs/{run_id}|{run_id}>"
-                    }
-                  ]
-                },                
-                {
-                    "type": "section",
-                    "fields": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Services:* "
-                        },
-                        {
-                            "type": "plain_text",
-                            "text": f"{services_list}"
-                        }
-                    ]
+                    "type": "plain_text",
+                    "text": f"{services_list}"
                 }
             ]
+        }
+    ]
+
+
+def _find_run_id(version):
+    """
+    Return the id of the newest recent deployment run whose title mentions version, or ""
+    """
+    response = _GH.get(_DEPLOYMENT_RUNS_PATH, params={"per_page": 10})
+    response.raise_for_status()
+    version = version.lower()
+    return next(
+        (str(run["id"]) for run in response.json()["workflow_runs"] if version in run["display_title"].lower()),
+        ""
+    )
+
+
+def _resolve_and_notify(client, channel, ts, version, services_list):
+    """
+    Poll for the workflow run started for version and update the deploy message with its link
+    """
+    run_id = ""
+    # Whether the last poll failed, as opposed to finding no run
+    lookup_failed = False
+    for i in range(10):
+        sleep(1)
+        try:
+            run_id = _find_run_id(version)
+        except Exception as e:
+            # A failed poll counts as a miss; the next one may succeed
+            logger.warning("[deploy] Workflow run lookup failed: %s", e)
+            lookup_failed = True
+            continue
+        lookup_failed = False
+        if run_id:
+            break
+
+    if run_id:
+        run_link = f"<https://github.com/scottseotech/todo-platform/actions/runs/{run_id}|{run_id}>"
+    elif lookup_failed:
+        run_link = "lookup failed"
+    else:
+        run_link = "not found"
+
+    # Always replace the "pending…" placeholder with a final state
+    try:
+        client.chat_update(
+            channel=channel,
+            ts=ts,
+            text=f"Service Deployment initiated",
+            blocks=_deployment_blocks(version, services_list, run_link)
         )
 
     except Exception as e:
-        logger.error(f"[deploy] Error handling submission: {e}", exc_info=True)
\ No newline at end of file
+        logger.exception("[deploy] Error updating deployment message: %s", e)
@@ -3,14 +3,50 @@ Event handlers for Slack events
 """
 
 import logging
-import asyncio
 import re
 from backends import ChatBackend
+from utils.async_loop import run_async
+from utils.background import run_in_background
+from utils.dedupe import RecentKeys
 from opentelemetry import trace
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# Slack tokens removed before a message is answered, in one pass: user
+# mentions <@U123>, channel links <#C123|name>, group mentions
+# <!subteam^S123|@team> and broadcasts such as <!here>
+_MENTION_RE = re.compile(
+    r'<@[A-Z0-9]+>'
+    r'|<#C[A-Z0-9]+(?:\|[^>]*)?>'
+    r'|<!subteam\^[A-Z0-9]+(?:\|[^>]*)?>'
+    r'|<![a-z]+(?:\|[^>]*)?>'
+)
+
+_HELP_TEXT = (
+    "I manage todos. Mention me with a request, for example:\n"
+    "• list my todos\n"
+    "• add a todo to buy milk\n"
+    "• update todo 2 to walk the dog\n"
+    "• delete todo 1\n\n"
+    "The `/todo` command does the same without going through the AI agent."
+)
+
+# Messages answered locally, without an LLM round trip
+_QUICK_REPLIES = {
+    "help": _HELP_TEXT,
+    "?": _HELP_TEXT,
+    "hi": "Hi <@{user}>! How can I help you?",
+    "hello": "Hi <@{user}>! How can I help you?",
+    "ping": "pong",
+}
+
+# "list", "list todos", "list my todos", "show my todo list", ...
+_LIST_RE = re.compile(r'(?:list|show)(?: (?:my|all))?(?: todos?(?: list)?)?[.!?]?')
+
+# Mentions already handled, so a redelivered event is not answered twice
+_handled_mentions = RecentKeys(ttl=60.0)
+
 # Global backend reference - should be set by main app
 _chat_backend: ChatBackend = None
 
@@ -20,11 +56,22 @@ def set_chat_backend(backend: ChatBackend):
     global _chat_backend
     _chat_backend = backend
 
-def app_mention(event, say):
+def app_mention(event, say, client):
     """
     Handle app mentions
     Responds when the bot is mentioned in a channel by relaying to LLM
     """
+    key = event.get("client_msg_id") or (event.get("channel"), event.get("ts"))
+    if _handled_mentions.seen(key):
+        logger.info("[app_mention] Ignoring repeated delivery of a handled mention")
+        return
+
+    # Bolt has already acked the event; the reply can take an LLM round trip
+    run_in_background(_process_mention, event, say, client)
+
+
+def _process_mention(event, say, client):
+    """Reply to a mention, locally when possible and otherwise through the chat backend"""
     with tracer.start_as_current_span(
         "app_mention",
         attributes={
@@ -38,8 +85,7 @@ def app_mention(event, say):
             text = event.get("text", "")
 
             # Remove bot mention from the text
-            # Slack mentions look like <@U12345678>
-            clean_text = re.sub(r'<@[A-Z0-9]+>', '', text).strip()
+            clean_text = _MENTION_RE.sub('', text).strip() if '<' in text else text.strip()
 
             span.set_attribute("message.text", clean_text)
 
@@ -51,6 +97,13 @@ def app_mention(event, say):
                 span.add_event("empty_message_received")
                 return
 
+            quick_reply = _quick_reply(clean_text, user)
+            if quick_reply is not None:
+                span.add_event("answered_locally")
+                say(text=quick_reply, thread_ts=event["ts"])
+                span.set_status(trace.Status(trace.StatusCode.OK))
+                return
+
             # Check if backend is configured
             if _chat_backend is None:
                 logger.warning("[app_mention] Chat backend not configured")
@@ -62,17 +115,28 @@ def app_mention(event, say):
                 return
 
             # Send to LLM
-            logger.info(f"[app_mention] Relaying to LLM: {clean_text}")
+            logger.info("[app_mention] Relaying to LLM: %s", clean_text)
             span.add_event("sending_to_llm")
 
-            # Run async function in sync context
-            response = asyncio.run(_chat_backend.chat(clean_text, user))
+            # Streamed replies are posted once and then edited in place as text arrives
+            posted = {}
+
+            def show(reply_text):
+                formatted = f"*AI Agent Response* for <@{user}>\n\n{reply_text}"
+                if not posted:
+                    message = say(formatted)
+                    posted.update(channel=message["channel"], ts=message["ts"], text=formatted)
+                elif formatted != posted["text"]:
+                    client.chat_update(channel=posted["channel"], ts=posted["ts"], text=formatted)
+                    posted["text"] = formatted
+
+            # Run on the shared event loop so the async OpenAI client keeps its connections
+            response = run_async(_chat_backend.chat(clean_text, user, on_partial=show))
 
             span.add_event("llm_response_received", attributes={"response.length": len(response)})
 
             # Format response in alert style
-            formatted_response = f"*AI Agent Response* for <@{user}>\n\n{response}"
-            say(formatted_response)
+            show(response)
 
             span.set_status(trace.Status(trace.StatusCode.OK))
 
@@ -83,7 +147,7 @@ def app_mention(event, say):
             # )
 
         except Exception as e:
-            logger.error(f"[app_mention] Error: {e}", exc_info=True)
+            logger.exception("[app_mention] Error: %s", e)
             span.record_exception(e)
             span.set_status(trace.Status(trace.StatusCode.ERROR, str(e)))
             try:
@@ -93,3 +157,18 @@ def app_mention(event, say):
                 )
             except:
                 pass
+
+
+def _quick_reply(text, user):
+    """Return a reply for messages that need no LLM, or None"""
+    normalized = " ".join(text.lower().split())
+    reply = _QUICK_REPLIES.get(normalized.rstrip("!."))
+    if reply is not None:
+        return reply.format(user=user)
+
+    if _LIST_RE.fullmatch(normalized) and _chat_backend is not None:
+        logger.info("[app_mention] Listing todos directly")
+        # Shares the backend's tool cache, error handling and formatting
+        return run_async(_chat_backend.list_todos())
+
+    return None
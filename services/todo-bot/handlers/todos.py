@@ -7,6 +7,8 @@ import os
 from datetime import datetime
 from todoclient import TodoClient
 from opentelemetry import trace
+from utils.background import run_in_background
+from utils.dedupe import RecentKeys
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -17,6 +19,84 @@ TODO_API_URL = os.environ.get("TODO_API_URL", "http://localhost:8080")
 # Initialize the client
 client = TodoClient(base_url=TODO_API_URL)
 
+# Commands already handled, keyed by trigger_id, so a resent command does not
+# add the same todo twice
+_handled_commands = RecentKeys(ttl=60.0)
+
+# Help text never changes, so its blocks are built once at import time
+_HELP_BLOCKS = [
+    {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": "Todo Bot Commands"
+        }
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*Available commands:*\n\n"
+                    "• `/todo add <text>` - Create a new todo\n"
+                    "• `/todo list` - List all todos\n"
+                    "• `/todo update <id> <text>` - Update a todo\n"
+                    "• `/todo delete <id>` - Delete a todo\n\n"
+                    "*Examples:*\n"
+                    "```/todo add Buy groceries\n"
+                    "/todo list\n"
+                    "/todo update 1 Buy milk\n"
+                    "/todo delete 1```"
+        }
+    }
+]
+
+# Fixed replies for errors and bad input; unpacked into respond(), never mutated
+_ERR_GENERIC = {"text": "❌ Sorry, something went wrong. Please try again.", "response_type": "in_channel"}
+_ERR_ADD_USAGE = {"text": "❌ Please provide a todo item.\n\nUsage: `/todo add <text>`", "response_type": "ephemeral"}
+_ERR_UPDATE_USAGE = {
+    "text": "❌ Usage: `/todo update <id> <new text>`\n\nExample: `/todo update 1 Buy milk`",
+    "response_type": "ephemeral"
+}
+_ERR_UPDATE_EMPTY = {"text": "❌ Please provide new text for the todo.", "response_type": "ephemeral"}
+_ERR_DELETE_USAGE = {"text": "❌ Usage: `/todo delete <id>`\n\nExample: `/todo delete 1`", "response_type": "ephemeral"}
+_ERR_INVALID_ID = {"text": "❌ Invalid todo ID. Must be a number.", "response_type": "ephemeral"}
+_NO_TODOS = {"text": "📭 No todos found. Create one with `/todo add <text>`", "response_type": "ephemeral"}
+
+# Static parts of the add/update/delete replies, shared by every response
+_DIVIDER_BLOCK = {"type": "divider"}
+
+
+def _header_block(text):
+    return {"type": "header", "text": {"type": "plain_text", "text": text}}
+
+
+_CREATED_HEADER_BLOCK = _header_block("Todo Created")
+_UPDATED_HEADER_BLOCK = _header_block("Todo Updated")
+_DELETED_HEADER_BLOCK = _header_block("Todo Deleted")
+
+
+_QUOTES = ('"', "'")
+
+
+def _unquote(text):
+    """Remove one pair of matching quotes around text, leaving inner quotes alone"""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in _QUOTES:
+        return text[1:-1]
+    return text
+
+
+def _meta_block(action, user_id):
+    """Context line naming who made the change and when"""
+    return {
+        "type": "context",
+        "elements": [
+            {
+                "type": "mrkdwn",
+                "text": f"{action} by <@{user_id}> | {datetime.now().isoformat(' ', 'minutes')}"
+            }
+        ]
+    }
+
 
 def todo_slash_command(ack, command, respond):
     """
@@ -31,29 +111,39 @@ def todo_slash_command(ack, command, respond):
     # Acknowledge the command request immediately
     ack()
 
+    trigger_id = command.get("trigger_id")
+    if trigger_id and _handled_commands.seen(trigger_id):
+        logger.info("[/todo] Ignoring repeated delivery of a handled command")
+        return
+
+    # respond() posts through the command's response_url, so the work can
+    # finish after this listener returns
+    run_in_background(_process_command, command, respond)
+
+
+def _process_command(command, respond):
+    """Run a /todo subcommand and respond with the result"""
+    # Extract command text
+    text = command.get("text", "").strip()
+    user_id = command.get("user_id", "unknown")
+    user_name = command.get("user_name", "unknown")
+
+    if not text:
+        # No subcommand - show help; too trivial to be worth a span
+        _show_help(respond)
+        return
+
     with tracer.start_as_current_span(
         "todo_slash_command",
         attributes={
             "slack.command": "/todo",
-            "slack.user_id": command.get("user_id"),
-            "slack.user_name": command.get("user_name"),
+            "slack.user_id": user_id,
+            "slack.user_name": user_name,
         }
     ) as span:
         try:
-            # Extract command text
-            text = command["text"].strip()
-            user_id = command.get("user_id", "unknown")
-            user_name = command.get("user_name", "unknown")
-
             # Parse subcommand
-            parts = text.split(maxsplit=1) if text else []
-
-            if not parts:
-                # No subcommand - show help
-                span.set_attribute("todo.subcommand", "help")
-                _show_help(respond)
-                return
-
+            parts = text.split(maxsplit=1)
             subcommand = parts[0].lower()
             args = parts[1] if len(parts) > 1 else ""
 
@@ -76,79 +166,41 @@ def todo_slash_command(ack, command, respond):
             span.set_status(trace.Status(trace.StatusCode.OK))
 
         except Exception as e:
-            logger.error(f"[/todo] Error: {e}", exc_info=True)
+            logger.exception("[/todo] Error: %s", e)
             span.record_exception(e)
             span.set_status(trace.Status(trace.StatusCode.ERROR, str(e)))
-            respond(
-                text="❌ Sorry, something went wrong. Please try again.",
-                response_type="in_channel"
-            )
+            respond(**_ERR_GENERIC)
 
 
 def _show_help(respond):
     """Show help message"""
     respond(
         text="Todo Bot - Help",
-        blocks=[
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Todo Bot Commands"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*Available commands:*\n\n"
-                            "• `/todo add <text>` - Create a new todo\n"
-                            "• `/todo list` - List all todos\n"
-                            "• `/todo update <id> <text>` - Update a todo\n"
-                            "• `/todo delete <id>` - Delete a todo\n\n"
-                            "*Examples:*\n"
-                            "```/todo add Buy groceries\n"
-                            "/todo list\n"
-                            "/todo update 1 Buy milk\n"
-                            "/todo delete 1```"
-                }
-            }
-        ],
+        blocks=_HELP_BLOCKS,
         response_type="in_channel"
     )
 
 
 def _handle_add(text, user_id, user_name, respond):
     """Handle add subcommand"""
-    cleaned_text = text.strip('"\'')
+    cleaned_text = _unquote(text)
 
     if not cleaned_text:
-        respond(
-            text="❌ Please provide a todo item.\n\nUsage: `/todo add <text>`",
-            response_type="ephemeral"
-        )
+        respond(**_ERR_ADD_USAGE)
         return
 
-    logger.info(f"[/todo add] User: {user_name}, Todo: '{cleaned_text}'")
+    logger.info("[/todo add] User: %s, Todo: %r", user_name, cleaned_text)
 
     # Call Todo API to create the todo
     todo = client.create_todo(title=cleaned_text)
-    logger.info(f"[/todo add] Created todo ID: {todo.id}")
+    logger.info("[/todo add] Created todo ID: %s", todo.id)
 
     # Respond with success
     respond(
         text=f"Todo added: \"{todo.title}\"",
         blocks=[
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Todo Created"
-                }
-            },
-            {
-                "type": "divider"
-            },
+            _CREATED_HEADER_BLOCK,
+            _DIVIDER_BLOCK,
             {
                 "type": "section",
                 "fields": [
@@ -162,15 +214,7 @@ def _handle_add(text, user_id, user_name, respond):
                     }
                 ]
             },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"Added by <@{user_id}> | {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                    }
-                ]
-            }
+            _meta_block("Added", user_id)
         ],
         response_type="in_channel"
     )
@@ -178,47 +222,37 @@ def _handle_add(text, user_id, user_name, respond):
 
 def _handle_list(user_id, respond):
     """Handle list subcommand"""
-    logger.info(f"[/todo list] Fetching todos")
+    logger.info("[/todo list] Fetching todos")
 
     # Get all todos from API
     todos = client.get_todos()
 
     if not todos:
-        respond(
-            text="📭 No todos found. Create one with `/todo add <text>`",
-            response_type="ephemeral"
-        )
+        respond(**_NO_TODOS)
         return
 
     # Build blocks for each todo
     blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": f"Your Todos ({len(todos)} items)"
+        _header_block(f"Your Todos ({len(todos)} items)"),
+        _DIVIDER_BLOCK,
+        *[
+            {
+                "type": "section",
+                "fields": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*#{todo.id}* - {todo.title}"
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Created:* {todo.created_at[:10]}"
+                    }
+                ]
             }
-        },
-        {
-            "type": "divider"
-        }
+            for todo in todos
+        ]
     ]
 
-    for todo in todos:
-        blocks.append({
-            "type": "section",
-            "fields": [
-                {
-                  "type": "mrkdwn",
-                  "text": f"*#{todo.id}* - {todo.title}"
-                },                
-                {
-                    "type": "mrkdwn",
-                    "text": f"*Created:* {todo.created_at[:10]}"
-                }
-            ]
-        })
-
     respond(
         text=f"📋 {len(todos)} todos",
         blocks=blocks,
@@ -231,21 +265,18 @@ def _handle_update(args, user_id, user_name, respond):
     parts = args.split(maxsplit=1)
 
     if len(parts) < 2:
-        respond(
-            text="❌ Usage: `/todo update <id> <new text>`\n\nExample: `/todo update 1 Buy milk`",
-            response_type="ephemeral"
-        )
+        respond(**_ERR_UPDATE_USAGE)
         return
 
     try:
         todo_id = int(parts[0])
-        new_title = parts[1].strip('"\'')
+        new_title = _unquote(parts[1])
 
         if not new_title:
-            respond(text="❌ Please provide new text for the todo.", response_type="ephemeral")
+            respond(**_ERR_UPDATE_EMPTY)
             return
 
-        logger.info(f"[/todo update] User: {user_name}, ID: {todo_id}, New title: '{new_title}'")
+        logger.info("[/todo update] User: %s, ID: %s, New title: %r", user_name, todo_id, new_title)
 
         # Update via API
         updated_todo = client.update_todo(todo_id, title=new_title)
@@ -253,16 +284,8 @@ def _handle_update(args, user_id, user_name, respond):
         respond(
             text=f"Todo #{todo_id} updated",
             blocks=[
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Todo Updated"
-                    }
-                },
-                {
-                    "type": "divider"
-                },
+                _UPDATED_HEADER_BLOCK,
+                _DIVIDER_BLOCK,
                 {
                     "type": "section",
                     "fields": [
@@ -276,39 +299,28 @@ def _handle_update(args, user_id, user_name, respond):
                         }
                     ]
                 },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"Updated by <@{user_id}> | {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                        }
-                    ]
-                }
+                _meta_block("Updated", user_id)
             ],
             response_type="in_channel"
         )
 
     except ValueError:
-        respond(text="❌ Invalid todo ID. Must be a number.", response_type="ephemeral")
+        respond(**_ERR_INVALID_ID)
     except Exception as e:
-        logger.error(f"[/todo update] Error: {e}", exc_info=True)
+        logger.exception("[/todo update] Error: %s", e)
         respond(text=f"❌ Failed to update todo: {str(e)}", response_type="ephemeral")
 
 
 def _handle_delete(args, user_id, user_name, respond):
     """Handle delete subcommand"""
     if not args:
-        respond(
-            text="❌ Usage: `/todo delete <id>`\n\nExample: `/todo delete 1`",
-            response_type="ephemeral"
-        )
+        respond(**_ERR_DELETE_USAGE)
         return
 
     try:
         todo_id = int(args.strip())
 
-        logger.info(f"[/todo delete] User: {user_name}, ID: {todo_id}")
+        logger.info("[/todo delete] User: %s, ID: %s", user_name, todo_id)
 
         # Delete via API
         client.delete_todo(todo_id)
@@ -316,16 +328,8 @@ def _handle_delete(args, user_id, user_name, respond):
         respond(
             text=f"Todo #{todo_id} deleted",
             blocks=[
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Todo Deleted"
-                    }
-                },
-                {
-                    "type": "divider"
-                },
+                _DELETED_HEADER_BLOCK,
+                _DIVIDER_BLOCK,
                 {
                     "type": "section",
                     "text": {
@@ -333,21 +337,13 @@ def _handle_delete(args, user_id, user_name, respond):
                         "text": f"Todo *#{todo_id}* has been deleted."
                     }
                 },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"Deleted by <@{user_id}> | {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                        }
-                    ]
-                }
+                _meta_block("Deleted", user_id)
             ],
             response_type="in_channel"
         )
 
     except ValueError:
-        respond(text="❌ Invalid todo ID. Must be a number.", response_type="ephemeral")
+        respond(**_ERR_INVALID_ID)
     except Exception as e:
-        logger.error(f"[/todo delete] Error: {e}", exc_info=True)
+        logger.exception("[/todo delete] Error: %s", e)
         respond(text=f"❌ Failed to delete todo: {str(e)}", response_type="ephemeral")
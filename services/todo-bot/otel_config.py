@@ -2,66 +2,83 @@
 OpenTelemetry configuration for todo-bot.
 
 This module initializes OpenTelemetry tracing with OTLP exporter to send traces
-to Tempo via gRPC. It also instruments the Flask app and requests library for
-automatic span creation.
+to Tempo via gRPC. It also instruments the requests library for automatic span
+creation.
 """
 
 import os
 import logging
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
 
 logger = logging.getLogger(__name__)
 
+# Read once at import; app.py loads .env before importing this module
+OTEL_ENABLED = os.getenv("OTEL_ENABLED", "true").lower() == "true"
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "todo-bot")
+SERVICE_VERSION = os.getenv("SERVICE_VERSION", "1.0.0")
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+OTEL_SAMPLE_RATIO = float(os.getenv("OTEL_SAMPLE_RATIO", "0.1"))
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "tempo:4317")
+OTLP_INSECURE = os.getenv("OTEL_EXPORTER_OTLP_INSECURE", "true").lower() == "true"
+OTEL_ENABLE_STDOUT = os.getenv("OTEL_ENABLE_STDOUT", "false").lower() == "true"
 
-def init_telemetry(app=None):
+
+def init_telemetry():
     """
     Initialize OpenTelemetry with OTLP exporter.
 
-    Args:
-        app: Optional Flask app to instrument
-
     Returns:
         Tracer instance for manual span creation
     """
     # Check if OTEL is enabled
-    otel_enabled = os.getenv("OTEL_ENABLED", "true").lower() == "true"
-    if not otel_enabled:
+    if not OTEL_ENABLED:
         logger.info("OpenTelemetry is disabled via OTEL_ENABLED env var")
         return None
 
+    # Imported only when tracing is enabled; the SDK, gRPC exporter and
+    # instrumentation are slow to import and unused otherwise
+    from grpc import Compression
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+
     # Create resource with service information
     resource = Resource.create({
-        "service.name": os.getenv("OTEL_SERVICE_NAME", "todo-bot"),
-        "service.version": os.getenv("SERVICE_VERSION", "1.0.0"),
-        "deployment.environment": os.getenv("ENVIRONMENT", "development")
+        "service.name": OTEL_SERVICE_NAME,
+        "service.version": SERVICE_VERSION,
+        "deployment.environment": ENVIRONMENT
     })
 
+    # Sample a share of new traces; spans with a sampled parent are always kept
+    sampler = ParentBased(root=TraceIdRatioBased(OTEL_SAMPLE_RATIO))
+
     # Create tracer provider
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(resource=resource, sampler=sampler)
 
     # Configure OTLP exporter (sends to Tempo)
-    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "tempo:4317")
-    insecure = os.getenv("OTEL_EXPORTER_OTLP_INSECURE", "true").lower() == "true"
-
-    logger.info(f"Configuring OTLP exporter: endpoint={otlp_endpoint}, insecure={insecure}")
+    logger.info(f"Configuring OTLP exporter: endpoint={OTLP_ENDPOINT}, insecure={OTLP_INSECURE}, sample_ratio={OTEL_SAMPLE_RATIO}")
 
     otlp_exporter = OTLPSpanExporter(
-        endpoint=otlp_endpoint,
-        insecure=insecure
+        endpoint=OTLP_ENDPOINT,
+        insecure=OTLP_INSECURE,
+        compression=Compression.Gzip
     )
 
-    # Add batch span processor for efficient export
-    provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+    # Add batch span processor for efficient export; larger batches mean
+    # fewer gRPC round trips to Tempo under load
+    provider.add_span_processor(BatchSpanProcessor(
+        otlp_exporter,
+        max_queue_size=8192,
+        max_export_batch_size=1024,
+        schedule_delay_millis=2000,
+        export_timeout_millis=10000
+    ))
 
     # Optionally add console exporter for debugging
-    stdout_enabled = os.getenv("OTEL_ENABLE_STDOUT", "false").lower() == "true"
-    if stdout_enabled:
+    if OTEL_ENABLE_STDOUT:
         logger.info("Console span exporter enabled for debugging")
         provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
 
@@ -72,21 +89,6 @@ def init_telemetry(app=None):
     RequestsInstrumentor().instrument()
     logger.info("Requests library instrumented for automatic tracing")
 
-    # Auto-instrument Flask app if provided
-    if app:
-        # Exclude health endpoint from tracing
-        def flask_request_hook(span, environ):
-            # Suppress tracing for health checks
-            if environ.get("PATH_INFO") == "/health":
-                span.set_attribute("http.route", "/health")
-                span.set_attribute("otel.suppress_instrumentation", True)
-
-        FlaskInstrumentor().instrument_app(
-            app,
-            excluded_urls="/health",  # Exclude health endpoint from tracing
-        )
-        logger.info("Flask app instrumented for automatic tracing (excluding /health)")
-
     logger.info("OpenTelemetry initialized successfully")
 
     # Return tracer for manual span creation
@@ -3,7 +3,16 @@ Utils package for todo-bot
 """
 
 from .subprocess import run_command
+from .async_loop import run_async, start_async_loop, stop_async_loop
+from .background import run_in_background, stop_background
+from .dedupe import RecentKeys
 
 __all__ = [
-    'run_command'
+    'run_command',
+    'run_async',
+    'start_async_loop',
+    'stop_async_loop',
+    'run_in_background',
+    'stop_background',
+    'RecentKeys'
 ]
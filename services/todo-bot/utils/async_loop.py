@@ -0,0 +1,55 @@
+"""
+Shared background event loop for running coroutines from sync handlers
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting it on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-loop", daemon=True).start()
+    return _loop
+
+
+def start_async_loop() -> None:
+    """Start the background loop now rather than on the first run_async call."""
+    _get_loop()
+
+
+def stop_async_loop(timeout: float = 5.0) -> None:
+    """Cancel outstanding work and stop the background loop."""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+
+    async def _cancel_pending():
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+
+    Unlike asyncio.run, the loop outlives the call, so async clients keep
+    their connection pools between Slack events.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
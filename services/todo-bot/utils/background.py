@@ -0,0 +1,34 @@
+"""
+Shared thread pool for handler work that runs after the Slack ack
+"""
+
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Bolt runs every listener on its own small pool, and a slash command is only
+# acked once a listener thread picks it up; slow LLM and API calls run here
+# instead so they cannot hold those threads
+HANDLER_WORKERS = int(os.environ.get("HANDLER_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=HANDLER_WORKERS, thread_name_prefix="handler")
+
+
+def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background handler failed", exc_info=future.exception())
+
+
+def run_in_background(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Run fn(*args, **kwargs) on the shared pool and return at once."""
+    future = _executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def stop_background(wait: bool = True) -> None:
+    """Stop accepting work, by default after queued work has finished."""
+    _executor.shutdown(wait=wait)
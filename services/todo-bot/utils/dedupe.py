@@ -0,0 +1,37 @@
+"""
+Short-lived record of handled Slack requests, used to drop repeated deliveries
+"""
+
+import threading
+import time
+from typing import Dict, Hashable
+
+
+class RecentKeys:
+    """Set of keys that each expire ttl seconds after they are added."""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 4096):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        # key -> expiry from time.monotonic(), oldest first
+        self._expiry: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def seen(self, key: Hashable) -> bool:
+        """Add key and return whether it was already present and unexpired."""
+        now = time.monotonic()
+        with self._lock:
+            expires = self._expiry.get(key)
+            if expires is not None:
+                if expires > now:
+                    return True
+                # Re-added below, at the end of the insertion order
+                del self._expiry[key]
+
+            if len(self._expiry) >= self._maxsize:
+                self._expiry = {k: v for k, v in self._expiry.items() if v > now}
+                if len(self._expiry) >= self._maxsize:
+                    # Dicts keep insertion order, so this drops the oldest key
+                    del self._expiry[next(iter(self._expiry))]
+            self._expiry[key] = now + self._ttl
+            return False
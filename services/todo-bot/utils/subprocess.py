@@ -16,7 +16,9 @@ def run_command(
     timeout: Optional[int] = 300,
     check: bool = True,
     shell: bool = False,
-    debug: bool = False
+    debug: bool = False,
+    capture: bool = True,
+    text: bool = True
 ) -> subprocess.CompletedProcess:
     """
     Execute a shell command using subprocess.run with sensible defaults.
@@ -28,6 +30,11 @@ def run_command(
         timeout: Command timeout in seconds (default: 300)
         check: Raise exception if command fails (default: True)
         shell: Run command through shell (required for pipes, redirects, etc.)
+        debug: Log the command and its output
+        capture: Capture stdout and stderr; when False stdout is discarded and
+                 is None on the result, while stderr is still captured for
+                 error logging (default: True)
+        text: Decode captured output as text rather than returning bytes (default: True)
 
     Returns:
         CompletedProcess instance with returncode, stdout, stderr
@@ -47,33 +54,33 @@ def run_command(
         >>> print(result.stdout)
         'hello'
     """
-    # Format command for logging
-    if isinstance(cmd, list):
-        cmd_str = ' '.join(cmd)
-    else:
-        cmd_str = cmd
-
-    if debug:
-        logger.info(f"Running command: {cmd_str}")
+    # Only format the command when it is actually logged
+    if debug and logger.isEnabledFor(logging.INFO):
+        logger.info("Running command: %s", ' '.join(cmd) if isinstance(cmd, list) else cmd)
 
     try:
+        if capture:
+            output = {"capture_output": True}
+        else:
+            output = {"stdout": subprocess.DEVNULL, "stderr": subprocess.PIPE}
+
         result = subprocess.run(
             cmd,
             cwd=cwd,
             env=env,
-            capture_output=True,
-            text=True,
+            text=text,
+            **output,
             timeout=timeout,
             check=check,
             shell=shell
         )
 
-        if debug:
-            logger.debug(f"Command completed with return code: {result.returncode}")
+        if debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command completed with return code: %s", result.returncode)
             if result.stdout:
-                logger.debug(f"stdout: {result.stdout.strip()}")
+                logger.debug("stdout: %s", result.stdout.strip())
             if result.stderr:
-                logger.debug(f"stderr: {result.stderr.strip()}")
+                logger.debug("stderr: %s", result.stderr.strip())
 
         return result
 